@@ -0,0 +1,3 @@
+# One-off benchmarks for the extractor, kept to re-measure after changes.
+# Run from backend/ as modules so the converter package is importable:
+#   python -m benchmarks.headings
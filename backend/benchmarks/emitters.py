@@ -0,0 +1,87 @@
+# Benchmark: description / TOC HTML emitters from 1k to 100k paragraphs
+#
+#   python -m benchmarks.emitters [max_paragraphs]   (from backend/)
+#
+# Builds synthetic compendium-style bodies in memory and times only the
+# emitters (the rules are fed Paragraph blocks directly, no .docx I/O).
+# Time per paragraph should stay flat as the report grows.
+
+import contextlib
+import copy
+import io
+import sys
+import time
+
+from docx import Document
+from docx.text.paragraph import Paragraph
+
+from converter.utils.extractor import _END, _description_rule, _toc_rule
+
+DESCRIPTION_CYCLE = [
+    ("By Type", True),
+    ("Segment overview paragraph with enough words to look like report prose.", False),
+    ("Another paragraph about adoption, pricing and regional demand.", False),
+    ("North America", False),
+    ("A long paragraph " + "with plenty of market commentary " * 8, False),
+]
+
+TOC_CYCLE = [
+    ("Market Overview", True),
+    ("• Market Definition", False),
+    ("Regional Analysis:", False),
+    ("• North America", False),
+    ("List of Figures", False),
+    ("– Figure entry", False),
+]
+
+
+def build_paragraphs(count, heading, cycle):
+    doc = Document()
+    first = doc.add_paragraph()
+    first.add_run(heading).bold = True
+    templates = []
+    for text, bold in cycle:
+        para = doc.add_paragraph()
+        para.add_run(text).bold = bold
+        templates.append(para)
+    # detached copies: doc.add_paragraph() itself slows down on huge bodies
+    paragraphs = [first]
+    for i in range(count - 1):
+        src = templates[i % len(templates)]
+        paragraphs.append(Paragraph(copy.deepcopy(src._p), src._parent))
+    return paragraphs
+
+
+def run_rule(rule_factory, paragraphs):
+    rule = rule_factory(None)
+    next(rule)
+    try:
+        for para in paragraphs:
+            rule.send(para)
+        rule.send(_END)
+    except StopIteration as done:
+        return done.value
+    raise RuntimeError("rule did not finish")
+
+
+def timed(rule_factory, paragraphs):
+    with contextlib.redirect_stdout(io.StringIO()):  # the TOC emitter logs every line
+        start = time.perf_counter()
+        run_rule(rule_factory, paragraphs)
+        return time.perf_counter() - start
+
+
+def main():
+    max_paragraphs = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    sizes = [n for n in (1_000, 10_000, 100_000) if n <= max_paragraphs]
+    print(f"{'paragraphs':>10} {'description us/para':>20} {'toc us/para':>12}")
+    for n in sizes:
+        description = build_paragraphs(n, "Introduction and Strategic Context", DESCRIPTION_CYCLE)
+        toc = build_paragraphs(n, "Executive Summary", TOC_CYCLE)
+        d = timed(_description_rule, description) * 1e6 / n
+        t = timed(_toc_rule, toc) * 1e6 / n
+        print(f"{n:>10} {d:>20.1f} {t:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
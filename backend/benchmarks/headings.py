@@ -0,0 +1,77 @@
+# Benchmark: description heading matching cost vs number of heading rules
+#
+#   python -m benchmarks.headings   (from backend/)
+#
+# Compares the old per-list scans (any(h in cleaned ...) / next(...)) with the
+# compiled PhraseMatcher as more "by X type" segmentation headings are added.
+# The scans grow linearly with the rule count; the matcher should stay flat.
+
+import random
+import time
+
+from converter.utils.matcher import PhraseMatcher
+from converter.utils.extractor import (
+    DESCRIPTION_END_PHRASES,
+    OPPORTUNITIES_HEADINGS,
+    REGIONAL_HEADINGS,
+    SEGMENTATION_HEADINGS,
+    TARGET_HEADINGS,
+)
+
+WORDS = ("market growth region demand product segment players device adoption "
+         "technology revenue forecast share europe type application").split()
+
+
+def make_paragraphs(count=2000, seed=7):
+    rng = random.Random(seed)
+    paragraphs = []
+    for _ in range(count):
+        paragraphs.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 60))))
+    return paragraphs
+
+
+def segmentation_rules(n):
+    extra = [f"by synthetic type {i}" for i in range(max(0, n - len(SEGMENTATION_HEADINGS)))]
+    return (SEGMENTATION_HEADINGS + extra)[:n]
+
+
+def scan(paragraphs, categories):
+    for cleaned in paragraphs:
+        for phrases in categories.values():
+            next((h for h in phrases if h in cleaned), None)
+
+
+def compiled(paragraphs, matcher):
+    for cleaned in paragraphs:
+        matcher.match(cleaned)
+
+
+def best_of(fn, *args, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    paragraphs = make_paragraphs()
+    print(f"{'rules':>6} {'scan us/para':>14} {'matcher us/para':>16}")
+    for n in (33, 100, 300, 1000):
+        categories = {
+            "target": TARGET_HEADINGS,
+            "regional": REGIONAL_HEADINGS,
+            "opportunities": OPPORTUNITIES_HEADINGS,
+            "segmentation": segmentation_rules(n),
+            "end": DESCRIPTION_END_PHRASES,
+        }
+        matcher = PhraseMatcher(categories)
+        per_para = 1e6 / len(paragraphs)
+        rules = sum(len(v) for v in categories.values())
+        print(f"{rules:>6} {best_of(scan, paragraphs, categories) * per_para:>14.2f}"
+              f" {best_of(compiled, paragraphs, matcher) * per_para:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# Benchmark: per-run text normalization cost
+#
+#   python -m benchmarks.normalize   (from backend/)
+#
+# Compares the old remove_emojis (13-range pattern rebuilt on every call) with
+# the module-level 3-range pattern + isascii() short-circuit, per run and per
+# paragraph with remove_emojis_many. Runs get a typographic character (curly
+# quote, dash, accent) or an emoji at the given rates.
+
+import random
+import re
+import time
+
+from converter.utils.normalize import remove_emojis, remove_emojis_many
+
+WORDS = ("market growth region demand product segment players device adoption "
+         "technology revenue forecast share europe type application").split()
+TYPOGRAPHIC = ("été", "Müller", "–", "\u2019s", "\u201cshare\u201d")
+EMOJIS = ("✅", "📈", "🚀", "★")
+
+
+def old_remove_emojis(text):
+    emoji_pattern = re.compile(
+        "["
+        "\U0001F600-\U0001F64F"
+        "\U0001F300-\U0001F5FF"
+        "\U0001F680-\U0001F6FF"
+        "\U0001F700-\U0001F77F"
+        "\U0001F780-\U0001F7FF"
+        "\U0001F800-\U0001F8FF"
+        "\U0001F900-\U0001F9FF"
+        "\U0001FA00-\U0001FAFF"
+        "\U00002600-\U000026FF"
+        "\U00002700-\U000027BF"
+        "\U00002B00-\U00002BFF"
+        "\U0001F1E0-\U0001F1FF"
+        "\U00010000-\U0010ffff"
+        "]+", flags=re.UNICODE
+    )
+    return emoji_pattern.sub(r'', text or "")
+
+
+def make_paragraphs(typographic_rate, emoji_rate, count=2000, seed=7):
+    rng = random.Random(seed)
+    paragraphs = []
+    for _ in range(count):
+        runs = []
+        for _ in range(rng.randint(1, 8)):
+            words = [rng.choice(WORDS) for _ in range(rng.randint(1, 12))]
+            if rng.random() < typographic_rate:
+                words.append(rng.choice(TYPOGRAPHIC))
+            if rng.random() < emoji_rate:
+                words.append(rng.choice(EMOJIS))
+            runs.append(" ".join(words))
+        paragraphs.append(runs)
+    return paragraphs
+
+
+def per_run_old(paragraphs):
+    for runs in paragraphs:
+        [old_remove_emojis(text) for text in runs]
+
+
+def per_run_new(paragraphs):
+    for runs in paragraphs:
+        [remove_emojis(text) for text in runs]
+
+
+def per_paragraph(paragraphs):
+    for runs in paragraphs:
+        remove_emojis_many(runs)
+
+
+def best_of(fn, *args, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    print(f"{'typo':>5} {'emoji':>6} {'old us/run':>11} {'new us/run':>11} {'paragraph us/run':>17}")
+    for typographic, emoji in ((0.0, 0.0), (0.3, 0.0), (0.3, 0.02), (0.3, 0.2), (0.3, 1.0)):
+        paragraphs = make_paragraphs(typographic, emoji)
+        for runs in paragraphs:
+            assert remove_emojis_many(runs) == [old_remove_emojis(text) for text in runs]
+        per_run = 1e6 / sum(len(runs) for runs in paragraphs)
+        print(f"{typographic:>5.2f} {emoji:>6.2f} {best_of(per_run_old, paragraphs) * per_run:>11.3f}"
+              f" {best_of(per_run_new, paragraphs) * per_run:>11.3f}"
+              f" {best_of(per_paragraph, paragraphs) * per_run:>17.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,23 @@
+import os
+import sys
+
 from django.apps import AppConfig
+from django.conf import settings
+
+
+def _serves_requests():
+    """False for management commands and runserver's autoreloader parent."""
+    if "runserver" in sys.argv:
+        return os.environ.get("RUN_MAIN") == "true" or "--noreload" in sys.argv
+    return not (len(sys.argv) > 1 and os.path.basename(sys.argv[0]) in ("manage.py", "run_server.py"))
 
 
 class ConverterConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'converter'
+
+    def ready(self):
+        # fork and warm the extractor workers now, not on the first /api/convert
+        if settings.EXTRACTOR_PREWARM and _serves_requests():
+            from converter import views
+            views.extractor_pool()
@@ -1,3 +1,233 @@
-from django.test import TestCase
+import contextlib
+import io
+import os
+import random
+import signal
+import tempfile
+import threading
+import time
+from pathlib import Path
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+
+from converter import views
+from converter.utils import extractor
+from converter.utils.cache import ExtractionCache, _extraction_modules
+from converter.utils.document import ENGINES, ParsedDocument
+from converter.utils.headings import HeadingCache
+from converter.utils.matcher import PhraseMatcher
+from converter.utils.pool import ExtractorPool, FileBudgetExceeded
+from converter.utils.scheduler import JobScheduler
+
+SAMPLE_DOCX = sorted(Path(__file__).resolve().parents[2].glob("*.docx"))
+
+# per-field functions, in ROW_FIELDS order
+PER_FIELD = {
+    "title": extractor.extract_title,
+    "description": extractor.extract_description,
+    "toc": extractor.extract_toc,
+    "methodology": extractor.extract_methodology_from_faqschema,
+    "seo_title": extractor.extract_seo_title,
+    "breadcrumb_text": extractor.extract_breadcrumb_text,
+    "skucode": extractor.extract_sku_code,
+    "urlrp": extractor.extract_sku_url,
+    "breadcrumb_schema": extractor.extract_breadcrumb_schema,
+    "meta": extractor.extract_meta_description,
+    "schema2": extractor.extract_faq_schema,
+    "report": extractor.extract_report_coverage_table_with_style,
+}
+
+
+def _quiet(fn, *args):
+    # the extractors print a DEBUG line per step
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args)
+
+
+# pool tasks: module level so the worker processes can unpickle them
+def _nap(seconds, tag=None):
+    time.sleep(seconds)
+    return tag, os.getpid()
+
+
+def _stuck(seconds):
+    """Sleep through the in-worker timer, like a file stuck inside lxml."""
+    signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+    time.sleep(seconds)
+    return os.getpid()
+
+
+class ExtractFieldsTests(TestCase):
+    def test_row_matches_per_field_functions(self):
+        self.assertTrue(SAMPLE_DOCX, "no sample .docx next to backend/")
+        self.assertEqual(list(PER_FIELD), extractor.ROW_FIELDS)
+        for path in SAMPLE_DOCX:
+            reference = None
+            for engine in ENGINES:
+                with self.subTest(file=path.name, engine=engine):
+                    with ParsedDocument(path, engine) as doc:
+                        row = _quiet(extractor.extract_all_data_fast, doc)
+                    fields = {}
+                    for field, fn in PER_FIELD.items():
+                        with ParsedDocument(path, engine) as doc:
+                            fields[field] = _quiet(fn, doc)
+                    self.assertEqual(row, fields)
+                    # and every engine reads the same values
+                    reference = reference or row
+                    self.assertEqual(row, reference)
+
+    def test_prefilter_does_not_change_the_row(self):
+        for path in SAMPLE_DOCX:
+            with ParsedDocument(path, "lite") as doc:
+                filtered = _quiet(extractor.extract_fields, doc, extractor.ROW_FIELDS, True)
+            with ParsedDocument(path, "lite") as doc:
+                walked = _quiet(extractor.extract_fields, doc, extractor.ROW_FIELDS, False)
+            self.assertEqual(filtered, walked)
+
+
+class PhraseMatcherTests(TestCase):
+    def assertMatchesSubstringSearch(self, categories, texts):
+        matcher = PhraseMatcher(categories)
+        for text in texts:
+            expected = {}
+            for name, phrases in categories.items():
+                found = next((p for p in phrases if p and p in text), None)
+                if found is not None:
+                    expected[name] = found
+            self.assertEqual(matcher.match(text), expected, text)
+
+    def test_description_headings(self):
+        categories = extractor._DESCRIPTION_HEADINGS.categories
+        phrases = [p for ps in categories.values() for p in ps]
+        rnd = random.Random(0)
+        texts = ["", "nothing to see here"] + phrases
+        texts += [" ".join(rnd.sample(phrases, 3)) for _ in range(200)]
+        texts += [rnd.choice(phrases)[:-1] for _ in range(50)]  # near misses
+        self.assertMatchesSubstringSearch(categories, texts)
+
+    def test_overlapping_and_prefix_phrases(self):
+        rnd = random.Random(1)
+        alphabet = "ab "
+        for _ in range(200):
+            categories = {
+                name: ["".join(rnd.choice(alphabet) for _ in range(rnd.randint(1, 4)))
+                       for _ in range(rnd.randint(1, 5))]
+                for name in "xyz"
+            }
+            texts = ["".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 12))) for _ in range(20)]
+            self.assertMatchesSubstringSearch(categories, texts)
+
+
+class ExtractionCacheTests(TestCase):
+    def test_evicts_least_recently_used_rows(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ExtractionCache(Path(tmp) / "cache.sqlite3", max_bytes=10_000)
+            for i in range(40):
+                cache.put(f"k{i}", {"value": "x" * 480})  # 500 bytes stored
+                if i >= 1:
+                    self.assertIsNotNone(cache.get("k0"))  # keep k0 recent
+            stats = cache.stats()
+            self.assertLessEqual(stats["bytes"], 10_000)
+            self.assertEqual(stats["bytes"], cache._total)
+            self.assertIsNotNone(cache.get("k0"))
+            self.assertIsNotNone(cache.get("k39"))
+            self.assertIsNone(cache.get("k1"))
+
+    def test_hit_rate_matches_the_heading_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ExtractionCache(Path(tmp) / "cache.sqlite3")
+            headings = HeadingCache()
+            for key in ("hits", "misses", "hit_rate"):
+                self.assertEqual(cache.stats()[key], headings.stats()[key])  # no lookups yet
+            cache.put("k", {"value": 1})
+            cache.get("k")
+            cache.get("missing")
+            self.assertEqual(cache.stats()["hit_rate"], 0.5)
+
+    def test_version_covers_only_extraction_modules(self):
+        names = {module.name for module in _extraction_modules()}
+        self.assertTrue({"extractor.py", "document.py", "package.py", "streaming.py"} <= names)
+        self.assertFalse({"pool.py", "cache.py"} & names)
+
+
+class ExtractorPoolTests(TestCase):
+    def _pool(self, workers, **budget):
+        pool = ExtractorPool(workers, **budget)
+        self.addCleanup(pool.shutdown)
+        return pool
+
+    def test_weighted_jobs_share_the_worker(self):
+        pool = self._pool(1)
+        # job "a" queues first, "b" has three times its weight
+        futures = [pool.submit(_nap, 0.02, "a", job="a", weight=1) for _ in range(8)]
+        futures += [pool.submit(_nap, 0.02, "b", job="b", weight=3) for _ in range(8)]
+        finished = []
+        for future in futures:
+            future.add_done_callback(lambda f: finished.append(f.result()[0]))
+        for future in futures:
+            future.result(timeout=60)
+        # the first "a" took the idle worker; after it, 3 of every 4 files are "b"
+        # until "b" runs out, and "a" is never starved
+        self.assertEqual(finished[0], "a")
+        self.assertEqual(finished[1:9].count("b"), 6, finished)
+        self.assertIn("a", finished[1:5], finished)
+
+    def test_file_over_its_timeout_fails_alone(self):
+        pool = self._pool(2, file_timeout=1)
+        slow = pool.submit(_nap, 30, job="a")
+        quick = [pool.submit(_nap, 0.05, i, job="a") for i in range(6)]
+        with self.assertRaisesRegex(FileBudgetExceeded, "timed out after 1s"):
+            slow.result(timeout=30)
+        self.assertEqual([f.result(timeout=30)[0] for f in quick], list(range(6)))
+        self.assertEqual(pool.stats()["killed"], 0)
+
+    def test_stuck_file_kills_only_its_worker(self):
+        pool = self._pool(2, file_timeout=1)
+        stuck = pool.submit(_stuck, 60, job="a")
+        quick = [pool.submit(_nap, 0.05, i, job="b") for i in range(6)]
+        # the other worker keeps going while the stuck one waits for the watchdog
+        results = [f.result(timeout=30) for f in quick]
+        self.assertFalse(stuck.done())
+        with self.assertRaisesRegex(FileBudgetExceeded, "worker killed"):
+            stuck.result(timeout=30)
+        stats = pool.stats()
+        self.assertEqual(stats["killed"], 1)
+        self.assertEqual(stats["replaced"], 1)  # the other worker was left alone
+        self.assertEqual([tag for tag, _pid in results], list(range(6)))
+        # and the pool still takes files after the kill
+        self.assertEqual(pool.submit(_nap, 0, "after", job="b").result(timeout=60)[0], "after")
+
+
+class PoolStatsViewTests(TestCase):
+    def test_polling_does_not_start_the_pool(self):
+        self.assertIsNone(views._POOL)
+        response = self.client.get("/api/pool/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"workers": 0, "started": False})
+        self.assertIsNone(views._POOL)
+
+
+class StartConvertViewTests(TestCase):
+    def test_second_start_of_a_queued_job_is_refused(self):
+        release = threading.Event()
+        scheduler = JobScheduler(max_jobs=1, short_slots=0)
+        scheduler.submit("busy", 1, release.wait)  # holds the only slot
+        previous, views._SCHEDULER = views._SCHEDULER, scheduler
+        views.JOBS["queued"] = {"progress": 0, "done": False}
+
+        def restore():
+            scheduler.cancel("queued")
+            release.set()
+            views._SCHEDULER = previous
+            views.JOBS.pop("queued", None)
+        self.addCleanup(restore)
+
+        with tempfile.TemporaryDirectory() as media, override_settings(MEDIA_ROOT=media):
+            os.mkdir(os.path.join(media, "queued"))
+            first = self.client.post("/api/convert/?jobId=queued")
+            second = self.client.post("/api/convert/?jobId=queued")
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first.json()["started"])
+        self.assertEqual(second.status_code, 409)
+        self.assertFalse(second.json()["started"])
+        self.assertEqual(second.json()["queue_position"], 1)
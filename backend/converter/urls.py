@@ -13,4 +13,5 @@ urlpatterns = [
     path("api/progress/", views.progress, name="progress"),
     path("api/result/", views.result_file, name="result_file"),
     path("api/reset/", views.reset_job, name="reset_job"),
+    path("api/pool/", views.pool_stats, name="pool_stats"),
 ]
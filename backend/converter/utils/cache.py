@@ -0,0 +1,175 @@
+import ast
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from converter.utils.stats import hit_rate
+
+_UTILS_DIR = Path(__file__).resolve().parent
+_UTILS_PACKAGE = "converter.utils"
+# rows dropped per DELETE when the cache is over budget
+_EVICT_BATCH = 256
+# eviction stops once the stored values fit in this share of max_bytes
+_EVICT_LOW_WATER = 0.9
+
+
+def file_digest(path) -> str:
+    """SHA-256 of the file contents."""
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _extraction_modules():
+    """extractor.py and every converter.utils module it imports, directly or not."""
+    seen = set()
+    todo = [_UTILS_DIR / "extractor.py"]
+    while todo:
+        module = todo.pop()
+        if module in seen or not module.exists():
+            continue
+        seen.add(module)
+        for node in ast.walk(ast.parse(module.read_bytes())):
+            if isinstance(node, ast.ImportFrom) and node.module:
+                names = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+            elif isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            else:
+                continue
+            for name in names:
+                if name.startswith(_UTILS_PACKAGE + "."):
+                    todo.append(_UTILS_DIR / (name[len(_UTILS_PACKAGE) + 1:].split(".")[0] + ".py"))
+    return sorted(seen)
+
+
+def extractor_version() -> str:
+    """Hash of extractor.py and the helper modules it imports.
+
+    Any edit to the extraction code changes the version, so stale rows are
+    simply never looked up again (and age out through LRU eviction). Modules
+    the extractor does not import (the pool, this cache) do not count.
+    """
+    sha = hashlib.sha256()
+    for module in _extraction_modules():
+        sha.update(module.name.encode())
+        sha.update(module.read_bytes())
+    return sha.hexdigest()[:16]
+
+
+class ExtractionCache:
+    """Persistent content-addressed cache of extracted row fields.
+
+    Rows are keyed by the SHA-256 of the .docx, its file name (the title,
+    SEO title and sku code are built from it) and the extractor version.
+    The total size of the stored values is bounded by ``max_bytes``; the
+    least recently used rows are evicted first. The total is kept as a
+    running count and only recounted when it goes over the limit.
+    """
+
+    def __init__(self, db_path, max_bytes=512 * 1024 * 1024):
+        self.db_path = str(db_path)
+        self.max_bytes = max_bytes
+        self.version = extractor_version()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS extraction ("
+                " key TEXT PRIMARY KEY,"
+                " fields TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " last_used REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS extraction_last_used ON extraction (last_used)")
+            self._total = db.execute("SELECT COALESCE(SUM(size), 0) FROM extraction").fetchone()[0]
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with db:  # commit / rollback
+                yield db
+        finally:
+            db.close()
+
+    def key_for(self, path) -> str:
+        path = Path(path)
+        return f"{file_digest(path)}:{path.stem}:{self.version}"
+
+    def get(self, key):
+        """Cached fields for ``key`` or None; a hit refreshes the row's LRU position."""
+        with self._connect() as db:
+            row = db.execute("SELECT fields FROM extraction WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                db.execute("UPDATE extraction SET last_used = ? WHERE key = ?", (time.time(), key))
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key, fields):
+        payload = json.dumps(fields, ensure_ascii=False)
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._connect() as db:
+            replaced = db.execute("SELECT size FROM extraction WHERE key = ?", (key,)).fetchone()
+            db.execute(
+                "INSERT OR REPLACE INTO extraction (key, fields, size, last_used) VALUES (?, ?, ?, ?)",
+                (key, payload, size, time.time()),
+            )
+            with self._lock:
+                self._total += size - (replaced[0] if replaced else 0)
+                over = self._total > self.max_bytes
+            if over:
+                self._evict(db)
+
+    def _evict(self, db):
+        """Drop the least recently used rows until the values fit in the low-water mark."""
+        # other processes write to the same file: recount before deleting
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM extraction").fetchone()[0]
+        target = int(self.max_bytes * _EVICT_LOW_WATER)
+        while total > target:
+            sizes = db.execute(
+                "SELECT size FROM extraction ORDER BY last_used LIMIT ?", (_EVICT_BATCH,)
+            ).fetchall()
+            if not sizes:
+                break
+            count = 0
+            for (size,) in sizes:
+                total -= size
+                count += 1
+                if total <= target:
+                    break
+            db.execute(
+                "DELETE FROM extraction WHERE key IN"
+                " (SELECT key FROM extraction ORDER BY last_used LIMIT ?)",
+                (count,),
+            )
+        with self._lock:
+            self._total = total
+
+    def stats(self):
+        with self._connect() as db:
+            entries, total = db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM extraction"
+            ).fetchone()
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        return {
+            **hit_rate(hits, misses),
+            "entries": entries,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+        }
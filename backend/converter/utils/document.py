@@ -0,0 +1,130 @@
+import os
+import zipfile
+from functools import cached_property
+
+from docx import Document
+from docx.oxml.table import CT_Tbl
+from docx.oxml.text.paragraph import CT_P
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+
+from converter.utils.package import LiteDocument, LitePackage, LitePart
+from converter.utils.streaming import iter_body_blocks
+
+# "docx": python-docx Document (whole package loaded up front)
+# "lite": only document.xml, styles.xml, numbering.xml and the rels are read
+# "stream": like "lite", but document.xml is streamed with lxml iterparse and
+#           blocks are freed as they are consumed
+ENGINES = ("docx", "lite", "stream")
+
+
+class ParsedDocument:
+    """A .docx opened once and shared by every extractor.
+
+    python-docx rebuilds ``doc.paragraphs``/``doc.tables`` on every access, so
+    the body is walked once here and the block lists are cached. With the
+    "stream" engine nothing is parsed up front; ``iter_blocks()`` reads the
+    body lazily and only the ``blocks``/``paragraphs``/``tables`` lists (if
+    someone asks for them) materialise the whole document. "lite" and
+    "stream" never load media, headers/footers or any other unused part.
+    """
+
+    def __init__(self, docx_path, engine="docx"):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown extractor engine {engine!r}, expected one of {ENGINES}")
+        self.path = str(docx_path)
+        self.filename = os.path.splitext(os.path.basename(self.path))[0]
+        self.engine = engine
+        self.package = None
+        self.document = None
+        if engine == "docx":
+            self.document = Document(self.path)
+        else:
+            self.package = LitePackage(self.path)
+            if engine == "lite":
+                self.document = LiteDocument(self.package)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def close(self):
+        """Drop the parsed tree and cached blocks."""
+        for name in ("blocks", "paragraphs", "tables", "text", "part"):
+            self.__dict__.pop(name, None)
+        self.document = None
+        self.package = None
+
+    def document_xml(self):
+        """Decompressed bytes of the main document part.
+
+        "lite" already read them to build its tree; the other engines read
+        them from the zip again.
+        """
+        if isinstance(self.document, LiteDocument):
+            return self.document.blob
+        if self.package is not None:
+            return self.package.read_document()
+        with zipfile.ZipFile(self.path) as archive:
+            return archive.read(self.document.part.partname.lstrip("/"))
+
+    @property
+    def element(self):
+        return self.document.element
+
+    @cached_property
+    def part(self):
+        if self.document is not None:
+            return self.document.part
+        return LitePart(self.package)
+
+    def iter_blocks(self):
+        """Body-level paragraphs and tables in document order."""
+        if self.engine == "stream" and "blocks" not in self.__dict__:
+            with self.package.open_document() as xml:
+                yield from iter_body_blocks(xml, self)
+        else:
+            yield from self.blocks
+
+    @cached_property
+    def blocks(self):
+        """Body-level paragraphs and tables in document order."""
+        if self.engine == "stream":
+            return list(self.iter_blocks())
+        blocks = []
+        for child in self.document.element.body.iterchildren():
+            if isinstance(child, CT_P):
+                blocks.append(Paragraph(child, self.document))
+            elif isinstance(child, CT_Tbl):
+                blocks.append(Table(child, self.document))
+        return blocks
+
+    @cached_property
+    def paragraphs(self):
+        return [b for b in self.blocks if isinstance(b, Paragraph)]
+
+    @cached_property
+    def tables(self):
+        return [b for b in self.blocks if isinstance(b, Table)]
+
+    @cached_property
+    def text(self):
+        """Non-empty paragraph texts joined by newlines (JSON-LD blocks live here)."""
+        return "\n".join(p.text for p in self.paragraphs if p.text and p.text.strip())
+
+
+def load_document(source):
+    """Return ``source`` if it is already parsed, otherwise open the path."""
+    if isinstance(source, ParsedDocument):
+        return source
+    return ParsedDocument(source)
+
+
+def document_name(source) -> str:
+    """File name without extension, without opening the document."""
+    if isinstance(source, ParsedDocument):
+        return source.filename
+    return os.path.splitext(os.path.basename(str(source)))[0]
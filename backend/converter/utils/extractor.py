@@ -1,19 +1,27 @@
-from docx import Document
-from datetime import date
+import bisect
 import json
 import html
 import re
-import os
-import pandas as pd
-from docx.oxml.text.paragraph import CT_P
-from docx.oxml.table import CT_Tbl
 from docx.text.paragraph import Paragraph
-from docx.table import Table
+from docx.table import Table, _Cell
 from docx.oxml.ns import qn
-from docx.text.run import Run
 import concurrent.futures
 import threading
+import weakref
 from functools import lru_cache
+from lxml import etree
+from docx.oxml.ns import nsmap
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from converter.utils.document import ParsedDocument, document_name, load_document
+from converter.utils.matcher import PhraseMatcher
+from converter.utils.package import LitePart
+from converter.utils.prefilter import MarkerPrefilter
+from converter.utils.styles import style_resolver
+from converter.utils.numbering import numbering_index
+from converter.utils.headings import HeadingCache
+from converter.utils.normalize import (
+    clean_description_heading, clean_toc_heading, collapse_ws, norm, remove_emojis, remove_emojis_many,
+)
 
 # ------------------- Helpers -------------------
 DASH = "–"  # en-dash for year ranges
@@ -37,32 +45,7 @@ def _get_pattern(pattern_key: str, pattern: str):
             _pattern_cache[pattern_key] = re.compile(pattern, re.I | re.X)
         return _pattern_cache[pattern_key]
 
-def remove_emojis(text: str) -> str:
-    """Universal emoji remover."""
-    emoji_pattern = re.compile(
-        "[" 
-        "\U0001F600-\U0001F64F"  # emoticons
-        "\U0001F300-\U0001F5FF"  # symbols & pictographs
-        "\U0001F680-\U0001F6FF"  # transport & map
-        "\U0001F700-\U0001F77F"  # alchemical
-        "\U0001F780-\U0001F7FF"  # geometric
-        "\U0001F800-\U0001F8FF"  # arrows
-        "\U0001F900-\U0001F9FF"  # supplemental
-        "\U0001FA00-\U0001FAFF"  # chess, symbols
-        "\U00002600-\U000026FF"  # misc symbols
-        "\U00002700-\U000027BF"  # dingbats
-        "\U00002B00-\U00002BFF"  # arrows & symbols
-        "\U0001F1E0-\U0001F1FF"  # flags
-       "\U00010000-\U0010ffff"
-        "]+", flags=re.UNICODE
-    )
-    return emoji_pattern.sub(r'', text or "")
-
 # ------------------- Normalization ------------------- 
-def _norm(s: str) -> str:
-    s = remove_emojis(s or "")
-    return re.sub(r"\s+", " ", s.strip())
-
 def _inline_title(text: str) -> str:
     m = re.split(r"[:\-–]", text, maxsplit=1)
     if len(m) > 1:
@@ -79,7 +62,7 @@ def _ensure_filename_start_and_year(title: str, filename: str) -> str:
         title = f"{filename} {title}"
     if not _year_range_present(title):
         title = f"{title} {DASH}2024–2030"
-    return _norm(title)
+    return norm(title)
 
 # ✅ Detect list items
 def is_list_item(para):
@@ -88,48 +71,363 @@ def is_list_item(para):
         return True
     return False
 
-# ------------------- Convert Paragraph to HTML -------------------
-def runs_to_html(runs):
-    """Convert Word runs (bold/italic) to inline HTML with hyperlink support."""
-    parts = []
-    for run in runs:
-        txt = remove_emojis(run.text.strip())
-        if not txt:
-            continue
+# ------------------- Paragraph Features -------------------
+LIST_MARK_CHARS = frozenset('•-–○◦‣▪▫*+')
+BULLET_CHARS = LIST_MARK_CHARS - {'-'}  # TOC bullets ('-' is too common in plain text)
+_NUMBERED_RE = re.compile(r'^\d+[\.\)]')
 
-        # hyperlink detection
-        if run._element.xpath("ancestor::w:hyperlink"):
-            rId = run._element.xpath("ancestor::w:hyperlink/@r:id")
-            if rId:
-                try:
-                    link = run.part.rels[rId[0]].target_ref
-                    parts.append(f'<a href="{link}">{txt}</a>')
-                except Exception:
-                    parts.append(txt)
+# cleaned TOC heading and description heading classification per paragraph
+# text, shared by all documents the process extracts
+_HEADINGS = HeadingCache()
+
+def heading_cache_stats():
+    """Entries, hits and misses of the process-wide heading cache."""
+    return _HEADINGS.stats()
+
+def count_heading_lookups(stats):
+    """Context manager adding this thread's heading cache hits/misses to ``stats``."""
+    return _HEADINGS.counting(stats)
+
+def _toc_heading_entry(text):
+    cleaned = clean_toc_heading(text)
+    return cleaned, cleaned.lower()
+
+def _desc_heading_entry(text):
+    cleaned = clean_description_heading(remove_emojis(text))
+    return cleaned, _DESCRIPTION_HEADINGS.match(cleaned)
+
+class ParagraphFeatures:
+    """Facts about one paragraph that TOC, description, title and meta all need.
+
+    ``text``/``lower`` are filled on creation, everything else on first use,
+    so each fact is computed at most once per paragraph however many
+    extractors look at it. Get one with ``paragraph_features(para)``.
+    """
+    __slots__ = ("para", "text", "lower", "_segments", "_clean", "_style", "_run_bold", "_in_list",
+                 "_list_level", "_marks", "_numbered", "_toc", "_desc")
+
+    def __init__(self, para):
+        self.para = para
+        self.text = para.text.strip()
+        self.lower = self.text.lower()
+        self._segments = self._clean = self._style = self._run_bold = self._in_list = None
+        self._list_level = False  # not looked up yet
+        self._marks = self._numbered = None
+        self._toc = self._desc = None  # HeadingCache entries
+
+    @property
+    def segments(self):
+        """``run_segments()`` of the paragraph's direct runs."""
+        if self._segments is None:
+            self._segments = list(run_segments(self.para))
+        return self._segments
+
+    @property
+    def clean(self):
+        """Stripped text without emojis."""
+        if self._clean is None:
+            self._clean = remove_emojis(self.text)
+        return self._clean
+
+    @property
+    def style(self):
+        """Resolved paragraph style (the default paragraph style when none is set)."""
+        if self._style is None:
+            self._style = part_styles(self.para.part).paragraph_style(self.para._p.style)
+        return self._style
+
+    @property
+    def run_bold(self):
+        """Any non-blank run is bold, directly or through its character / paragraph style."""
+        if self._run_bold is None:
+            styles = part_styles(self.para.part)
+            if not styles.has_formatting:
+                self._run_bold = any(bold for text, bold, _i, _h, _br in self.segments if text.strip())
             else:
-                parts.append(txt)
-        elif run.bold and run.italic:
-            parts.append(f"<b><i>{txt}</i></b>")
-        elif run.bold:
-            parts.append(f"<b>{txt}</b>")
-        elif run.italic:
-            parts.append(f"<i>{txt}</i>")
+                para_style = self.style
+                self._run_bold = any(
+                    styles.run_format(bold, italic, r.rPr.style if r.rPr is not None else None, para_style)[0]
+                    for (text, bold, italic, _h, _br), r in zip(self.segments, _RUNS_XPATH(self.para._p))
+                    if text.strip()
+                )
+        return self._run_bold
+
+    @property
+    def tag_bold(self):
+        return '<strong>' in self.text or '<b>' in self.text
+
+    @property
+    def bold(self):
+        return self.run_bold or self.tag_bold
+
+    @property
+    def in_list(self):
+        """Word list formatting (w:numPr)."""
+        if self._in_list is None:
+            self._in_list = is_list_item(self.para)
+        return self._in_list
+
+    @property
+    def list_level(self):
+        """ListLevel (level, bullet/ordered format) of a Word list paragraph
+        from numbering.xml; None when it has no resolvable w:numPr."""
+        if self._list_level is False:
+            self._list_level = None
+            pPr = self.para._p.pPr
+            numPr = pPr.numPr if pPr is not None else None
+            if numPr is not None and numPr.numId is not None:
+                ilvl = numPr.ilvl.val if numPr.ilvl is not None else 0
+                self._list_level = part_numbering(self.para.part).lookup(numPr.numId.val, ilvl)
+        return self._list_level
+
+    @property
+    def ilvl(self):
+        """The paragraph's own w:ilvl (0 without one), also when numbering.xml
+        has no definition for its numId."""
+        pPr = self.para._p.pPr
+        numPr = pPr.numPr if pPr is not None else None
+        if numPr is None or numPr.ilvl is None:
+            return 0
+        return numPr.ilvl.val
+
+    @property
+    def marks(self):
+        """List marker characters present anywhere in the text."""
+        if self._marks is None:
+            self._marks = LIST_MARK_CHARS.intersection(self.text)
+        return self._marks
+
+    @property
+    def has_bullet_chars(self):
+        return not BULLET_CHARS.isdisjoint(self.marks)
+
+    @property
+    def numbered(self):
+        """Text starts with "1." / "1)" style numbering."""
+        if self._numbered is None:
+            self._numbered = _NUMBERED_RE.match(self.text) is not None
+        return self._numbered
+
+    @property
+    def toc_heading(self):
+        if self._toc is None:
+            self._toc = _HEADINGS.get("toc", self.text, _toc_heading_entry)
+        return self._toc[0]
+
+    @property
+    def toc_lower(self):
+        if self._toc is None:
+            self._toc = _HEADINGS.get("toc", self.text, _toc_heading_entry)
+        return self._toc[1]
+
+    @property
+    def desc_heading(self):
+        if self._desc is None:
+            self._desc = _HEADINGS.get("description", self.text, _desc_heading_entry)
+        return self._desc[0]
+
+    @property
+    def desc_headings(self):
+        """``_DESCRIPTION_HEADINGS.match(desc_heading)``; shared, do not modify."""
+        if self._desc is None:
+            self._desc = _HEADINGS.get("description", self.text, _desc_heading_entry)
+        return self._desc[1]
+
+# ------------------- Table Features -------------------
+COVERAGE_TABLE_KEYWORDS = ("report attribute", "report coverage table", "forecast period",
+                           "market size", "revenue forecast")
+TITLE_CELL_KEYWORDS = ("report title", "full title", "full report title")
+
+class LayoutCell:
+    """One ``w:tc`` as rendered: its python-docx cell, stripped text, the grid
+    column it starts at and how many columns / rows it spans."""
+    __slots__ = ("cell", "text", "col", "colspan", "rowspan")
+
+    def __init__(self, cell, col, colspan):
+        self.cell = cell
+        self.text = cell.text.strip()
+        self.col = col
+        self.colspan = colspan
+        self.rowspan = 1
+
+    def span_attrs(self, quote='"'):
+        """`` colspan=".." rowspan=".."`` for merged cells, "" otherwise."""
+        attrs = ""
+        if self.colspan > 1:
+            attrs += f" colspan={quote}{self.colspan}{quote}"
+        if self.rowspan > 1:
+            attrs += f" rowspan={quote}{self.rowspan}{quote}"
+        return attrs
+
+
+def _table_grid(table):
+    """Walk ``w:tr``/``w:tc`` once; return ``(rows, texts, layout)``.
+
+    ``rows``/``texts`` repeat merged cells the way ``row.cells`` does, without
+    python-docx's per-cell lookup of the cell above a vertical merge.
+    ``layout`` has one LayoutCell per cell that starts in the row: ``gridSpan``
+    becomes ``colspan`` and each ``vMerge`` continuation adds to the
+    ``rowspan`` of the cell it continues instead of being rendered again.
+    """
+    rows, texts, layout = [], [], []
+    above = {}  # grid column -> LayoutCell covering it in the previous row
+    for tr in table._tbl.tr_lst:
+        cells, cell_texts, placed, current = [], [], [], {}
+        col = tr.grid_before
+        for tc in tr.tc_lst:
+            span = tc.grid_span
+            entry = above.get(col) if tc.vMerge == "continue" else None
+            if entry is not None:
+                entry.rowspan += 1
+            else:
+                entry = LayoutCell(_Cell(tc, table), col, span)
+                placed.append(entry)
+            current[col] = entry
+            cells.extend([entry.cell] * entry.colspan)
+            cell_texts.extend([entry.text] * entry.colspan)
+            col += span
+        above = current
+        rows.append(cells)
+        texts.append(cell_texts)
+        layout.append(placed)
+    return rows, texts, layout
+
+
+class TableFeatures:
+    """One walk over a table's cells, shared by the title, SEO title,
+    breadcrumb, description and report coverage extractors.
+
+    ``rows`` holds python-docx cells (merged cells repeated, as ``row.cells``
+    returns them) and ``texts`` their stripped text; ``layout`` is the same
+    table with merges resolved, one LayoutCell per rendered ``<td>``. ``kinds`` classifies the
+    table from its header row: "coverage" (report coverage table), "attribute"
+    (Report Attribute / Details table, whose rows are in ``attributes``) and
+    "title" (has a Report Title / Full Title cell). Get one with
+    ``table_features(table)``.
+    """
+    __slots__ = ("table", "rows", "texts", "layout", "header", "header_text", "kinds",
+                 "attributes", "_title_text")
+
+    def __init__(self, table):
+        self.table = table
+        self.rows, self.texts, self.layout = _table_grid(table)
+        self.header = [text.lower() for text in self.texts[0]] if self.texts else []
+        self.header_text = " ".join(self.header)
+        self._title_text = False  # not looked up yet
+
+        kinds = set()
+        header_text = self.header_text
+        if (any(k in header_text for k in COVERAGE_TABLE_KEYWORDS) or
+                ("forecast" in header_text and "period" in header_text) or
+                ("market" in header_text and "size" in header_text)):
+            kinds.add("coverage")
+        self.attributes = {}
+        if "report attribute" in self.header and "details" in self.header:
+            kinds.add("attribute")
+            attr_idx = self.header.index("report attribute")
+            details_idx = self.header.index("details")
+            for texts in self.texts[1:]:
+                self.attributes.setdefault(texts[attr_idx].lower(), texts[details_idx])
+        if any(k in text.lower() for texts in self.texts for text in texts for k in TITLE_CELL_KEYWORDS):
+            kinds.add("title")
+        self.kinds = frozenset(kinds)
+
+    def attribute(self, name):
+        """Details of the first attribute row whose (lowercase) name contains ``name``."""
+        for attr, details in self.attributes.items():
+            if name in attr:
+                return details
+        return None
+
+    @property
+    def title_text(self):
+        """Text next to (or else below) the first non-empty Report Title cell, or None."""
+        if self._title_text is False:
+            self._title_text = None
+            if "title" in self.kinds:
+                self._title_text = self._find_title_text()
+        return self._title_text
+
+    def _find_title_text(self):
+        texts = self.texts
+        for r_idx, row in enumerate(texts):
+            for c_idx, cell_text in enumerate(row):
+                cell_text = cell_text.lower()
+                if not cell_text:
+                    continue
+                if any(k in cell_text for k in TITLE_CELL_KEYWORDS):
+                    if c_idx + 1 < len(row) and row[c_idx + 1]:
+                        return row[c_idx + 1]
+                    if r_idx + 1 < len(texts) and texts[r_idx + 1][c_idx]:
+                        return texts[r_idx + 1][c_idx]
+        return None
+
+# part -> StyleResolver, one lookup per document part
+_PART_STYLES = weakref.WeakKeyDictionary()
+
+def part_styles(part):
+    """StyleResolver for the styles.xml of a document part; documents with
+    identical styles.xml share one (see style_resolver)."""
+    resolver = _PART_STYLES.get(part)
+    if resolver is None:
+        blob = part.styles_xml if isinstance(part, LitePart) else part._styles_part.blob
+        resolver = _PART_STYLES[part] = style_resolver(blob)
+    return resolver
+
+# part -> NumberingIndex, one lookup per document part
+_PART_NUMBERING = weakref.WeakKeyDictionary()
+
+def part_numbering(part):
+    """NumberingIndex for the numbering.xml of a document part (shared by
+    documents with identical numbering.xml, see numbering_index)."""
+    index = _PART_NUMBERING.get(part)
+    if index is None:
+        if isinstance(part, LitePart):
+            blob = part.numbering_xml
         else:
-            parts.append(txt)
-    return " ".join(parts).strip()
+            try:
+                blob = part.part_related_by(RT.NUMBERING).blob
+            except KeyError:
+                blob = None
+        index = _PART_NUMBERING[part] = numbering_index(blob)
+    return index
+
+def table_features(table):
+    """The table's TableFeatures, built on first request and kept on the Table."""
+    try:
+        return table._features
+    except AttributeError:
+        table._features = feats = TableFeatures(table)
+        return feats
+
+def paragraph_features(para):
+    """The paragraph's ParagraphFeatures, built on first request.
+
+    The record is kept on the Paragraph object itself; ParsedDocument and the
+    single-walk driver hand the same Paragraph to every extractor, so the
+    table is effectively built once per document.
+    """
+    try:
+        return para._features
+    except AttributeError:
+        para._features = feats = ParagraphFeatures(para)
+        return feats
+
+# ------------------- Convert Paragraph to HTML -------------------
+def _cell_html(cell):
+    """A cell's paragraphs rendered with their bold/italic runs, space-joined."""
+    return " ".join(runs_to_html(run_segments(para)) for para in cell.paragraphs).strip()
 
 def extract_table_with_style(table):
     """Extract table with proper HTML styling using inline CSS"""
     html_parts = []
     html_parts.append('<table style="border-collapse: collapse; width:100%;">')
-    for row in table.rows:
+    for row in table_features(table).layout:
         html_parts.append("<tr>")
-        for cell in row.cells:
-            cell_text = " ".join(
-                runs_to_html(para.runs) for para in cell.paragraphs
-            ).strip()
+        for entry in row:
+            cell_text = _cell_html(entry.cell)
             html_parts.append(
-                f'<td style="border:1px solid #000; padding:6px;">{cell_text}</td>'
+                f'<td{entry.span_attrs()} style="border:1px solid #000; padding:6px;">{cell_text}</td>'
             )
         html_parts.append("</tr>")
     html_parts.append("</table>")
@@ -319,61 +617,27 @@ def extract_table_with_style(table):
 #     return "\n".join(html_output)
 
 # ------------------- TOC Extraction -------------------
-def determine_toc_logic(doc):
-    """Determine which logic to use based on document structure"""
-    executive_summary_bold = False
-    executive_summary_in_list = False
-    first_line_after_bold = False
-    first_line_after_in_list = False
-    has_nested_lists = False
-    para_count = 0
-    found_executive_summary = False
-    
-    for para in doc.paragraphs:
-        text = para.text.strip()
-        if not text:
-            continue
-        
-        # Check if this is Executive Summary
-        if "executive summary" in text.lower():
-            found_executive_summary = True
-            # Check for bold (including <strong> tags)
-            executive_summary_bold = any(run.bold for run in para.runs if run.text.strip()) or '<strong>' in text or '<b>' in text
-            executive_summary_in_list = is_list_item(para) or any(char in text for char in ['•', '-', '–', '○', '◦', '‣', '▪', '▫', '*', '+']) or re.match(r'^\d+[\.\)]', text)
-            print(f"DEBUG: Executive Summary found: '{text[:50]}...' - Bold: {executive_summary_bold}, In List: {executive_summary_in_list}")
-            continue
-            
-        # Only check lines after Executive Summary
-        if not found_executive_summary:
-            continue
-            
-        para_count += 1
-        # Check for bold (including <strong> tags)
-        is_bold = any(run.bold for run in para.runs if run.text.strip()) or '<strong>' in text or '<b>' in text
-        # Check for list items (including Word's list formatting)
-        is_in_list = (
-            is_list_item(para) or  # Check Word's list formatting first
-            any(char in text for char in ['•', '-', '–', '○', '◦', '‣', '▪', '▫', '*', '+']) or 
-            re.match(r'^\d+[\.\)]', text)
-        )
-        
-        # Check first line after Executive Summary
-        if para_count == 1:
-            first_line_after_bold = is_bold
-            first_line_after_in_list = is_in_list
-            print(f"DEBUG: First line after Executive Summary: '{text[:50]}...' - Bold: {is_bold}, In List: {is_in_list}")
-        
-        # Check for nested lists (parent/child structure)
-        # LOGIC 2 is detected when we have a mix of main headings and list items
-        # For now, we'll disable automatic nested list detection and rely on the user's input
-        # to determine which logic to use
-    
+def _toc_line_flags(feats):
+    """(bold, in list) of a line, as the TOC logic detection sees it."""
+    is_bold = feats.bold
+    is_in_list = (
+        feats.in_list or  # Check Word's list formatting first
+        bool(feats.marks) or
+        feats.numbered
+    )
+    return is_bold, is_in_list
+
+def _select_toc_logic(executive_summary_flags, first_line_flags):
+    """Pick TOC logic 1/2/3 from the "Executive Summary" line and the first line after it."""
+    executive_summary_bold, executive_summary_in_list = executive_summary_flags or (False, False)
+    first_line_after_bold, first_line_after_in_list = first_line_flags or (False, False)
+
     # Logic detection
-    print(f"DEBUG: Detection results - para_count: {para_count}, has_nested_lists: {has_nested_lists}")
+    print(f"DEBUG: Detection results - para_count: {int(first_line_flags is not None)}, has_nested_lists: False")
     print(f"DEBUG: executive_summary_bold: {executive_summary_bold}, executive_summary_in_list: {executive_summary_in_list}")
     print(f"DEBUG: first_line_after_bold: {first_line_after_bold}, first_line_after_in_list: {first_line_after_in_list}")
     
-    if para_count >= 1:
+    if first_line_flags is not None:
         # LOGIC 2: Parent-child structure (Executive Summary bold+list, first line after non-bold+list)
         if executive_summary_bold and executive_summary_in_list and first_line_after_in_list and not first_line_after_bold:
             print("DEBUG: Selected LOGIC 2 (Parent-child structure: Executive Summary bold+list, first line after non-bold+list)")
@@ -399,48 +663,153 @@ def determine_toc_logic(doc):
     print("DEBUG: Selected LOGIC 1 (default)")
     return 1
 
+def determine_toc_logic(doc):
+    """Determine which logic to use based on document structure (doc or list of paragraphs)"""
+    executive_summary_flags = None
+    first_line_flags = None
+    
+    for para in getattr(doc, "paragraphs", doc):
+        feats = paragraph_features(para)
+        text = feats.text
+        if not text:
+            continue
+        
+        # Check if this is Executive Summary (a later mention overrides the flags)
+        if "executive summary" in feats.lower:
+            executive_summary_flags = _toc_line_flags(feats)
+            print(f"DEBUG: Executive Summary found: '{text[:50]}...' - Bold: {executive_summary_flags[0]}, In List: {executive_summary_flags[1]}")
+            continue
+            
+        # Only the first line after Executive Summary matters
+        if executive_summary_flags is not None and first_line_flags is None:
+            first_line_flags = _toc_line_flags(feats)
+            print(f"DEBUG: First line after Executive Summary: '{text[:50]}...' - Bold: {first_line_flags[0]}, In List: {first_line_flags[1]}")
+    
+    return _select_toc_logic(executive_summary_flags, first_line_flags)
+
 def extract_toc(docx_path):
-    doc = Document(docx_path)
+    return _extract_field(docx_path, "toc")
+
+def _toc_rule(doc):
+    """Emit the TOC in the same pass that finds it.
+
+    Paragraphs are held back only until the logic can be chosen, i.e. until
+    the first non-empty line after "Executive Summary"; they are then
+    replayed into the emitter and everything after streams straight through.
+    determine_toc_logic() lets a later "executive summary" mention override
+    the Executive Summary flags, so only those flags are kept up to date;
+    in the rare case such a mention changes the logic, the TOC is emitted
+    again from a second walk over the document (_toc_rewalk).
+    """
+    paragraphs = []  # until the emitter starts
+    started = False
+    executive_summary_flags = None
+    first_line_flags = None
+    emitter = None
+    logic_type = None
+    while True:
+        block = yield
+        if block is _END:
+            break
+        if not isinstance(block, Paragraph):
+            continue
+        feats = paragraph_features(block)
+        if not started:
+            if "executive summary" not in feats.lower and "executive summary" not in feats.toc_lower:
+                continue
+            started = True
+
+        if feats.text:
+            if "executive summary" in feats.lower:
+                executive_summary_flags = _toc_line_flags(feats)
+            elif executive_summary_flags is not None and first_line_flags is None:
+                first_line_flags = _toc_line_flags(feats)
+
+        if emitter is not None:
+            emitter.send(block)
+            continue
+        paragraphs.append(block)
+        if first_line_flags is not None:
+            logic_type = _select_toc_logic(executive_summary_flags, first_line_flags)
+            print(f"DEBUG: Logic type determined: {logic_type}")  # Debug output
+            emitter = _toc_emitter(logic_type)
+            next(emitter)
+            for para in paragraphs:
+                emitter.send(para)
+            paragraphs = None
+
+    if emitter is None:
+        return _toc_html(paragraphs)
+    final_logic = _select_toc_logic(executive_summary_flags, first_line_flags)
+    if final_logic != logic_type:
+        emitter.close()
+        print(f"DEBUG: Logic type changed to {final_logic} by a later Executive Summary, re-reading")  # Debug output
+        return _toc_rewalk(doc, final_logic)
+    try:
+        emitter.send(_END)
+    except StopIteration as done:
+        return done.value
+
+def _toc_rewalk(doc, logic_type):
+    """TOC HTML with ``logic_type``, from a fresh walk over the document's blocks."""
+    emitter = _toc_emitter(logic_type)
+    next(emitter)
+    started = False
+    blocks = doc.iter_blocks()
+    try:
+        for block in blocks:
+            if not isinstance(block, Paragraph):
+                continue
+            if not started:
+                feats = paragraph_features(block)
+                if "executive summary" not in feats.lower and "executive summary" not in feats.toc_lower:
+                    continue
+                started = True
+            emitter.send(block)
+    finally:
+        blocks.close()
+    try:
+        emitter.send(_END)
+    except StopIteration as done:
+        return done.value
+
+def _toc_html(paragraphs):
+    """TOC HTML for paragraphs starting at the "Executive Summary" line."""
+    # Determine which logic to use for this file
+    logic_type = determine_toc_logic(paragraphs)
+    print(f"DEBUG: Logic type determined: {logic_type}")  # Debug output
+    emitter = _toc_emitter(logic_type)
+    next(emitter)
+    for para in paragraphs:
+        emitter.send(para)
+    try:
+        emitter.send(_END)
+    except StopIteration as done:
+        return done.value
+
+def _toc_emitter(logic_type):
+    """Generator that is sent TOC paragraphs one by one, then _END; returns the HTML."""
     html_output = []
+    last_figures_at = -1  # index of the latest output line mentioning "List of Figures"
     capture = False
     inside_list = False
     list_depth = 0  # Track nesting depth
     previous_was_bold = False
     in_nested_context = False
-    
-    # Determine which logic to use for this file
-    logic_type = determine_toc_logic(doc)
-    print(f"DEBUG: Logic type determined: {logic_type}")  # Debug output
 
-    def clean_heading(text):
-        """Clean heading text by removing numbering, bullets, and extra spaces"""
-        text = remove_emojis(text.strip())
-        # Remove numbering patterns like "1.", "1.1", "1.1.1", etc.
-        text = re.sub(r'^\d+(\.\d+)*[\.\)]\s*', '', text)
-        # Remove bullet points
-        text = re.sub(r'^[•\-–]\s*', '', text)
-        # Remove extra spaces
-        text = re.sub(r'\s+', ' ', text)
-        return text.strip()
-
-    def is_bold_text(para):
-        """Check if paragraph has bold text (including <strong> tags)"""
-        if para.runs:
-            # Check for run.bold
-            has_bold_run = any(run.bold for run in para.runs if run.text.strip())
-            if has_bold_run:
-                return True
-            
-            # Also check if the text contains <strong> tags
-            text = para.text.strip()
-            if '<strong>' in text or '<b>' in text:
-                return True
-                
-        return False
+    def emit(item):
+        nonlocal last_figures_at
+        if "List of Figures" in item:
+            last_figures_at = len(html_output)
+        html_output.append(item)
+
+    def figures_nearby():
+        """"List of Figures" is in one of the last 10 output lines."""
+        return last_figures_at >= max(0, len(html_output) - 10)
 
     def is_heading(para):
         """Check if paragraph is a heading based on style or pattern"""
-        style_name = getattr(para.style, "name", "").lower()
+        style_name = paragraph_features(para).style.name.lower()
         if "heading" in style_name:
             return True
         # Check for numbered patterns like "1. Title", "1.1 Subtitle"
@@ -450,64 +819,60 @@ def extract_toc(docx_path):
 
     def is_subheading(para):
         """Check if paragraph is a subheading (level 2 or deeper)"""
-        style_name = getattr(para.style, "name", "").lower()
-        if "heading" in style_name:
-            level = para.style.name.replace("Heading", "").strip()
-            if level.isdigit() and int(level) >= 3:
+        style = paragraph_features(para).style
+        if "heading" in style.name.lower():
+            if style.heading_level is not None and style.heading_level >= 3:
                 return True
         # Check for deeper numbering patterns like "1.1", "1.1.1", etc.
         if re.match(r'^\d+\.\d+', para.text.strip()):
             return True
         return False
 
-    def runs_to_html_with_links(runs):
-        """Convert Word runs to HTML with proper formatting and links"""
+    def runs_to_html_with_links(segments):
+        """Convert run segments to HTML with proper formatting and links"""
         parts = []
-        for run in runs:
-            txt = remove_emojis(run.text.strip())
+        segments = coalesce_segments(segments)
+        texts = [text.strip() for text in remove_emojis_many(text for text, *_ in segments)]
+        for txt, (_text, bold, italic, href, _br) in zip(texts, segments):
             if not txt:
                 continue
 
             # Check for hyperlinks
-            if run._element.xpath("ancestor::w:hyperlink"):
-                rId = run._element.xpath("ancestor::w:hyperlink/@r:id")
-                if rId:
-                    try:
-                        link = run.part.rels[rId[0]].target_ref
-                        parts.append(f'<a href="{link}">{txt}</a>')
-                    except Exception:
-                        parts.append(txt)
-                else:
-                    parts.append(txt)
-            elif run.bold and run.italic:
+            if href is not None:
+                parts.append(f'<a href="{href}">{txt}</a>' if href else txt)
+            elif bold and italic:
                 parts.append(f"<b><i>{txt}</i></b>")
-            elif run.bold:
+            elif bold:
                 parts.append(f"<b>{txt}</b>")
-            elif run.italic:
+            elif italic:
                 parts.append(f"<i>{txt}</i>")
             else:
                 parts.append(txt)
         return " ".join(parts).strip()
 
-    for para in doc.paragraphs:
-        text = para.text.strip()
+    while True:
+        para = yield
+        if para is _END:
+            break
+        feats = paragraph_features(para)
+        text = feats.text
         if not text:
             continue
 
-        cleaned_text = clean_heading(text)
-        low = cleaned_text.lower()
-        is_bold = is_bold_text(para)
+        cleaned_text = feats.toc_heading
+        low = feats.toc_lower
+        is_bold = feats.run_bold or (feats.tag_bold and bool(feats.segments))
 
         # Start condition: Look for "Executive Summary" (ignore numbering/bullets)
         if not capture and "executive summary" in low:
             capture = True
             # Process Executive Summary itself
             if is_bold:
-                heading_text = clean_heading(text)
+                heading_text = feats.toc_heading
                 if heading_text:
                     # For headings, keep only <strong> tags, remove <b> tags
                     heading_text = heading_text.replace('<b>', '').replace('</b>', '')
-                    html_output.append(f"\n<strong>{heading_text}</strong>")
+                    emit(f"\n<strong>{heading_text}</strong>")
             continue
 
         # Only process content after Executive Summary is found
@@ -518,10 +883,10 @@ def extract_toc(docx_path):
                 print(f"DEBUG LOGIC 1: Processing '{text[:30]}...' - is_bold: {is_bold}")
                 
                 # Check if this is a nested list item - rely primarily on Word's list formatting
-                is_word_list_item = is_list_item(para)
+                is_word_list_item = feats.in_list
                 # Also check for common list patterns as fallback
-                has_bullet_chars = any(char in text for char in ['•', '–', '○', '◦', '‣', '▪', '▫', '*', '+'])
-                has_numbering = re.match(r'^\d+[\.\)]', text)
+                has_bullet_chars = feats.has_bullet_chars
+                has_numbering = feats.numbered
                 is_nested_list = is_word_list_item or has_bullet_chars or has_numbering
                 
                 if is_bold:
@@ -533,36 +898,36 @@ def extract_toc(docx_path):
                     
                     if is_in_list:
                         # This is bold text within a list item - keep it as part of the list
-                        formatted_content = runs_to_html_with_links(para.runs)
+                        formatted_content = runs_to_html_with_links(run_segments(para, links=True))
                         
                         # Check if this should be a parent item (ends with colon)
                         is_parent_item = (
                             ":" in formatted_content and formatted_content.strip().endswith(":")
-                        ) and "List of Figures" not in "\n".join(html_output[-10:])
+                        ) and not figures_nearby()
                         
                         if is_parent_item:
                             # This is a parent item that should have nested children
                             if inside_list:
                                 # Close any existing nested structure
                                 for _ in range(list_depth):
-                                    html_output.append("</ul>")
+                                    emit("</ul>")
                                 list_depth = 0
                                 inside_list = False
                             
-                            html_output.append("<ul>")
-                            html_output.append(f"<li><p>{formatted_content}</p>")
-                            html_output.append("<ul>")  # Start nested list for children
+                            emit("<ul>")
+                            emit(f"<li><p>{formatted_content}</p>")
+                            emit("<ul>")  # Start nested list for children
                             inside_list = True
                             list_depth = 2  # We have main list + nested list
                             print(f"DEBUG LOGIC 1: Added bold parent item with nested list: {formatted_content[:30]}...")
                         else:
                             # This is a bold list item (not a parent)
                             if not inside_list:
-                                html_output.append("<ul>")
+                                emit("<ul>")
                                 inside_list = True
                                 list_depth = 1
                             
-                            html_output.append(f"<li><p>{formatted_content}</p></li>")
+                            emit(f"<li><p>{formatted_content}</p></li>")
                             print(f"DEBUG LOGIC 1: Added bold list item: {formatted_content[:30]}...")
                     else:
                         # Bold text is NOT in list - treat as heading
@@ -570,51 +935,39 @@ def extract_toc(docx_path):
                         if inside_list:
                             # Close all open lists based on depth
                             for _ in range(list_depth):
-                                html_output.append("</ul>")
+                                emit("</ul>")
                             inside_list = False
                             list_depth = 0
                         
-                        heading_text = clean_heading(text)
+                        heading_text = feats.toc_heading
                         if heading_text:
                             # For headings, keep only <strong> tags, remove <b> tags
                             heading_text = heading_text.replace('<b>', '').replace('</b>', '')
-                            html_output.append(f"\n<strong>{heading_text}</strong>")
+                            emit(f"\n<strong>{heading_text}</strong>")
                             print(f"DEBUG LOGIC 1: Added <strong> for bold heading (not in list): {heading_text[:30]}...")
                 else:
                     # Non-bold text - check if it's a nested list item
                     if is_nested_list:
-                        # This is a nested list item - check list style for nesting logic
-                        formatted_content = runs_to_html_with_links(para.runs)
-                        
-                        # Get current list style (bullet type)
-                        current_list_style = "bullet"  # Default
-                        if has_bullet_chars:
-                            if '•' in text or '*' in text:
-                                current_list_style = "bullet"
-                            elif '○' in text or '◦' in text:
-                                current_list_style = "circle"
-                            elif '-' in text or '–' in text:
-                                current_list_style = "dash"
-                        elif has_numbering:
-                            current_list_style = "number"
+                        # This is a nested list item
+                        formatted_content = runs_to_html_with_links(run_segments(para, links=True))
                         
                         # Check if this should be a parent item (ends with colon)
                         is_parent_item = (
                             ":" in formatted_content and formatted_content.strip().endswith(":")
-                        ) and "List of Figures" not in "\n".join(html_output[-10:])
+                        ) and not figures_nearby()
                         
                         if is_parent_item:
                             # This is a parent item that should have nested children
                             if inside_list:
                                 # Close any existing nested structure
                                 for _ in range(list_depth):
-                                    html_output.append("</ul>")
+                                    emit("</ul>")
                                 list_depth = 0
                                 inside_list = False
                             
-                            html_output.append("<ul>")
-                            html_output.append(f"<li><p>{formatted_content}</p>")
-                            html_output.append("<ul>")  # Start nested list for children
+                            emit("<ul>")
+                            emit(f"<li><p>{formatted_content}</p>")
+                            emit("<ul>")  # Start nested list for children
                             inside_list = True
                             list_depth = 2  # We have main list + nested list
                             print(f"DEBUG LOGIC 1: Added parent item with nested list: {formatted_content[:30]}...")
@@ -625,48 +978,48 @@ def extract_toc(docx_path):
                             if is_new_main_section:
                                 # Close any existing nested structure first
                                 if inside_list and list_depth > 1:
-                                    html_output.append("</ul>")  # Close nested list
-                                    html_output.append("</li>")  # Close parent item
-                                    html_output.append("</ul>")  # Close main list
+                                    emit("</ul>")  # Close nested list
+                                    emit("</li>")  # Close parent item
+                                    emit("</ul>")  # Close main list
                                     inside_list = False
                                     list_depth = 0
                                 
                                 # Add as new main list item
                                 if not inside_list:
-                                    html_output.append("<ul>")
+                                    emit("<ul>")
                                     inside_list = True
                                     list_depth = 1
                                 
-                                html_output.append(f"<li><p>{formatted_content}</p></li>")
+                                emit(f"<li><p>{formatted_content}</p></li>")
                                 print(f"DEBUG LOGIC 1: Added main list item: {formatted_content[:30]}...")
                             else:
                                 # Check if this should be a child item based on list style
                                 # If we're inside a nested list and list style is same, add as child
                                 if inside_list and list_depth > 1:
                                     # We're inside a nested list, add as child item
-                                    html_output.append(f"<li><p>{formatted_content}</p></li>")
+                                    emit(f"<li><p>{formatted_content}</p></li>")
                                     print(f"DEBUG LOGIC 1: Added child item: {formatted_content[:30]}...")
                                 else:
                                     # Not inside nested list or different style, create new main list
                                     if not inside_list:
-                                        html_output.append("<ul>")
+                                        emit("<ul>")
                                         inside_list = True
                                         list_depth = 1
                                     
-                                    html_output.append(f"<li><p>{formatted_content}</p></li>")
+                                    emit(f"<li><p>{formatted_content}</p></li>")
                                     print(f"DEBUG LOGIC 1: Added list item: {formatted_content[:30]}...")
                     elif ":" in formatted_content and formatted_content.strip().endswith(":"):
                         # This is a parent item that should have nested children (not detected as list item)
                         if inside_list:
                             # Close all open lists based on depth
                             for _ in range(list_depth):
-                                html_output.append("</ul>")
+                                emit("</ul>")
                             inside_list = False
                             list_depth = 0
                         
-                        html_output.append("<ul>")
-                        html_output.append(f"<li><p>{formatted_content}</p>")
-                        html_output.append("<ul>")  # Start nested list for children
+                        emit("<ul>")
+                        emit(f"<li><p>{formatted_content}</p>")
+                        emit("<ul>")  # Start nested list for children
                         inside_list = True
                         list_depth = 2  # We have main list + nested list
                         print(f"DEBUG LOGIC 1: Added parent item with nested list (non-list): {formatted_content[:30]}...")
@@ -675,13 +1028,13 @@ def extract_toc(docx_path):
                         if inside_list:
                             # Close all open lists based on depth
                             for _ in range(list_depth):
-                                html_output.append("</ul>")
+                                emit("</ul>")
                             inside_list = False
                             list_depth = 0
                         
-                        formatted_content = runs_to_html_with_links(para.runs)
+                        formatted_content = runs_to_html_with_links(run_segments(para, links=True))
                         if formatted_content:
-                            html_output.append(f"<p>{formatted_content}</p>")
+                            emit(f"<p>{formatted_content}</p>")
                             print(f"DEBUG LOGIC 1: Added <p> for regular text: {formatted_content[:30]}...")
                         
             elif logic_type == 2:
@@ -695,58 +1048,46 @@ def extract_toc(docx_path):
                     if inside_list:
                         # Close all open lists based on depth
                         for _ in range(list_depth):
-                            html_output.append("</ul>")
+                            emit("</ul>")
                         inside_list = False
                         list_depth = 0
                     
-                    heading_text = clean_heading(text)
+                    heading_text = feats.toc_heading
                     if heading_text:
                         # For headings, keep only <strong> tags, remove <b> tags
                         heading_text = heading_text.replace('<b>', '').replace('</b>', '')
-                        html_output.append(f"\n<strong>{heading_text}</strong>")
+                        emit(f"\n<strong>{heading_text}</strong>")
                         print(f"DEBUG LOGIC 2: Added parent heading: {heading_text[:30]}...")
                 else:
                     # Non-bold text = Child item (list item)
                     # Check if this is a nested list item - rely primarily on Word's list formatting
-                    is_word_list_item = is_list_item(para)
+                    is_word_list_item = feats.in_list
                     # Also check for common list patterns as fallback
-                    has_bullet_chars = any(char in text for char in ['•', '–', '○', '◦', '‣', '▪', '▫', '*', '+'])
-                    has_numbering = re.match(r'^\d+[\.\)]', text)
+                    has_bullet_chars = feats.has_bullet_chars
+                    has_numbering = feats.numbered
                     is_nested_list = is_word_list_item or has_bullet_chars or has_numbering
                     
                     if is_nested_list:
-                        # This is a nested list item - check list style for nesting logic
-                        formatted_content = runs_to_html_with_links(para.runs)
-                        
-                        # Get current list style (bullet type)
-                        current_list_style = "bullet"  # Default
-                        if has_bullet_chars:
-                            if '•' in text or '*' in text:
-                                current_list_style = "bullet"
-                            elif '○' in text or '◦' in text:
-                                current_list_style = "circle"
-                            elif '–' in text:
-                                current_list_style = "dash"
-                        elif has_numbering:
-                            current_list_style = "number"
+                        # This is a nested list item
+                        formatted_content = runs_to_html_with_links(run_segments(para, links=True))
                         
                         # Check if this should be a parent item (ends with colon)
                         is_parent_item = (
                             ":" in formatted_content and formatted_content.strip().endswith(":")
-                        ) and "List of Figures" not in "\n".join(html_output[-10:])
+                        ) and not figures_nearby()
                         
                         if is_parent_item:
                             # This is a parent item that should have nested children
                             if inside_list:
                                 # Close any existing nested structure
                                 for _ in range(list_depth):
-                                    html_output.append("</ul>")
+                                    emit("</ul>")
                                 list_depth = 0
                                 inside_list = False
                             
-                            html_output.append("<ul>")
-                            html_output.append(f"<li><p>{formatted_content}</p>")
-                            html_output.append("<ul>")  # Start nested list for children
+                            emit("<ul>")
+                            emit(f"<li><p>{formatted_content}</p>")
+                            emit("<ul>")  # Start nested list for children
                             inside_list = True
                             list_depth = 2  # We have main list + nested list
                             print(f"DEBUG LOGIC 2: Added parent item with nested list: {formatted_content[:30]}...")
@@ -757,48 +1098,48 @@ def extract_toc(docx_path):
                             if is_new_main_section:
                                 # Close any existing nested structure first
                                 if inside_list and list_depth > 1:
-                                    html_output.append("</ul>")  # Close nested list
-                                    html_output.append("</li>")  # Close parent item
-                                    html_output.append("</ul>")  # Close main list
+                                    emit("</ul>")  # Close nested list
+                                    emit("</li>")  # Close parent item
+                                    emit("</ul>")  # Close main list
                                     inside_list = False
                                     list_depth = 0
                                 
                                 # Add as new main list item
                                 if not inside_list:
-                                    html_output.append("<ul>")
+                                    emit("<ul>")
                                     inside_list = True
                                     list_depth = 1
                                 
-                                html_output.append(f"<li><p>{formatted_content}</p></li>")
+                                emit(f"<li><p>{formatted_content}</p></li>")
                                 print(f"DEBUG LOGIC 2: Added main list item: {formatted_content[:30]}...")
                             else:
                                 # Check if this should be a child item based on list style
                                 # If we're inside a nested list and list style is same, add as child
                                 if inside_list and list_depth > 1:
                                     # We're inside a nested list, add as child item
-                                    html_output.append(f"<li><p>{formatted_content}</p></li>")
+                                    emit(f"<li><p>{formatted_content}</p></li>")
                                     print(f"DEBUG LOGIC 2: Added child item: {formatted_content[:30]}...")
                                 else:
                                     # Not inside nested list or different style, create new main list
                                     if not inside_list:
-                                        html_output.append("<ul>")
+                                        emit("<ul>")
                                         inside_list = True
                                         list_depth = 1
                                     
-                                    html_output.append(f"<li><p>{formatted_content}</p></li>")
+                                    emit(f"<li><p>{formatted_content}</p></li>")
                                     print(f"DEBUG LOGIC 2: Added list item: {formatted_content[:30]}...")
                     elif ":" in formatted_content and formatted_content.strip().endswith(":"):
                         # This is a parent item that should have nested children (not detected as list item)
                         if inside_list:
                             # Close all open lists based on depth
                             for _ in range(list_depth):
-                                html_output.append("</ul>")
+                                emit("</ul>")
                             inside_list = False
                             list_depth = 0
                         
-                        html_output.append("<ul>")
-                        html_output.append(f"<li><p>{formatted_content}</p>")
-                        html_output.append("<ul>")  # Start nested list for children
+                        emit("<ul>")
+                        emit(f"<li><p>{formatted_content}</p>")
+                        emit("<ul>")  # Start nested list for children
                         inside_list = True
                         list_depth = 2  # We have main list + nested list
                         print(f"DEBUG LOGIC 2: Added parent item with nested list (non-list): {formatted_content[:30]}...")
@@ -807,13 +1148,13 @@ def extract_toc(docx_path):
                         if inside_list:
                             # Close all open lists based on depth
                             for _ in range(list_depth):
-                                html_output.append("</ul>")
+                                emit("</ul>")
                             inside_list = False
                             list_depth = 0
                         
-                        formatted_content = runs_to_html_with_links(para.runs)
+                        formatted_content = runs_to_html_with_links(run_segments(para, links=True))
                         if formatted_content:
-                            html_output.append(f"<p>{formatted_content}</p>")
+                            emit(f"<p>{formatted_content}</p>")
                             print(f"DEBUG LOGIC 2: Added <p> for regular text: {formatted_content[:30]}...")
                     
             elif logic_type == 3:
@@ -821,12 +1162,12 @@ def extract_toc(docx_path):
                 print(f"DEBUG LOGIC 3: Processing '{text[:30]}...' - is_bold: {is_bold}")
                 
                 # Get formatted content
-                formatted_content = runs_to_html_with_links(para.runs)
+                formatted_content = runs_to_html_with_links(run_segments(para, links=True))
                 
                 # Check if this is a list item
-                is_word_list_item = is_list_item(para)
-                has_bullet_chars = any(char in text for char in ['•', '–', '○', '◦', '‣', '▪', '▫', '*', '+'])
-                has_numbering = re.match(r'^\d+[\.\)]', text)
+                is_word_list_item = feats.in_list
+                has_bullet_chars = feats.has_bullet_chars
+                has_numbering = feats.numbered
                 is_list_item_detected = is_word_list_item or has_bullet_chars or has_numbering
                 
                 if is_list_item_detected:
@@ -835,16 +1176,7 @@ def extract_toc(docx_path):
                     formatted_content = formatted_content.replace('<strong>', '').replace('</strong>', '')
                     
                     # Detect list level from Word's list formatting
-                    list_level = 0
-                    if is_word_list_item:
-                        try:
-                            pPr = para._p.pPr
-                            if pPr is not None and pPr.numPr is not None:
-                                ilvl = pPr.numPr.ilvl
-                                if ilvl is not None:
-                                    list_level = int(ilvl.val) if hasattr(ilvl, 'val') else 0
-                        except:
-                            list_level = 0
+                    list_level = feats.ilvl
                     
                     # Also check indentation patterns
                     text_indent = len(text) - len(text.lstrip())
@@ -864,20 +1196,20 @@ def extract_toc(docx_path):
                          ("North America" in formatted_content or "Europe" in formatted_content or 
                           "Asia-Pacific" in formatted_content or "Latin America" in formatted_content or 
                           "Middle East" in formatted_content))
-                    ) and "List of Figures" not in "\n".join(html_output[-10:])  # Check recent output for List of Figures
+                    ) and not figures_nearby()  # Check recent output for List of Figures
                     
                     if is_parent_item:
                         # This is a parent item that should have nested children
                         if inside_list:
                             # Close any existing nested structure
                             for _ in range(list_depth):
-                                html_output.append("</ul>")
+                                emit("</ul>")
                             list_depth = 0
                             inside_list = False
                         
-                        html_output.append("<ul>")
-                        html_output.append(f"<li><p>{formatted_content}</p>")
-                        html_output.append("<ul>")  # Start nested list for children
+                        emit("<ul>")
+                        emit(f"<li><p>{formatted_content}</p>")
+                        emit("<ul>")  # Start nested list for children
                         inside_list = True
                         list_depth = 2  # We have main list + nested list
                         print(f"DEBUG LOGIC 3: Added parent item with nested list: {formatted_content[:30]}...")
@@ -886,45 +1218,45 @@ def extract_toc(docx_path):
                         # Check if this should be a grand child item (ends with colon)
                         is_grand_child = (
                             ":" in formatted_content and formatted_content.strip().endswith(":")
-                        ) and "List of Figures" not in "\n".join(html_output[-10:])
+                        ) and not figures_nearby()
                         
                         if is_grand_child:
                             # This is a grand child item (like "Country-Level Breakdown:")
                             if inside_list and list_depth > 1:
                                 # We're inside a nested list, add as grand child item
-                                html_output.append(f"<li><p>{formatted_content}</p>")
-                                html_output.append("<ul>")  # Start grand child list
+                                emit(f"<li><p>{formatted_content}</p>")
+                                emit("<ul>")  # Start grand child list
                                 nested_list_open = True
                                 list_depth = 3  # We have main + nested + grand child
                                 print(f"DEBUG LOGIC 3: Added grand child item: {formatted_content[:30]}...")
                             else:
                                 # Not inside nested list, create new main list
                                 if not inside_list:
-                                    html_output.append("<ul>")
+                                    emit("<ul>")
                                     inside_list = True
                                     list_depth = 1
                                 
-                                html_output.append(f"<li><p>{formatted_content}</p></li>")
+                                emit(f"<li><p>{formatted_content}</p></li>")
                                 print(f"DEBUG LOGIC 3: Added list item: {formatted_content[:30]}...")
                         elif "Country-Level Breakdown:" in formatted_content:
                             # Special handling for Country-Level Breakdown - always treat as child item
                             if not inside_list:
-                                html_output.append("<ul>")
+                                emit("<ul>")
                                 inside_list = True
                                 list_depth = 1
                             
-                            html_output.append(f"<li><p>{formatted_content}</p>")
-                            html_output.append("<ul>")  # Start nested list for countries
+                            emit(f"<li><p>{formatted_content}</p>")
+                            emit("<ul>")  # Start nested list for countries
                             list_depth = 2  # We have main list + nested list
                             print(f"DEBUG LOGIC 3: Added Country-Level Breakdown as child item: {formatted_content[:30]}...")
                         else:
                             # Regular child item
                             if not inside_list:
-                                html_output.append("<ul>")
+                                emit("<ul>")
                                 inside_list = True
                                 list_depth = 1
                             
-                            html_output.append(f"<li><p>{formatted_content}</p></li>")
+                            emit(f"<li><p>{formatted_content}</p></li>")
                             print(f"DEBUG LOGIC 3: Added list item: {formatted_content[:30]}...")
                         
                 elif is_bold and not is_list_item_detected:
@@ -932,13 +1264,13 @@ def extract_toc(docx_path):
                     if inside_list:
                         # Close all open lists based on depth
                         for _ in range(list_depth):
-                            html_output.append("</ul>")
+                            emit("</ul>")
                         inside_list = False
                         list_depth = 0
                     
-                    heading_text = clean_heading(text)
+                    heading_text = feats.toc_heading
                     if heading_text:
-                        html_output.append(f"\n<strong>{heading_text}</strong>")
+                        emit(f"\n<strong>{heading_text}</strong>")
                         print(f"DEBUG LOGIC 3: Added bold heading: {heading_text[:30]}...")
                         
                 elif ":" in formatted_content and formatted_content.strip().endswith(":") and "Country-Level Breakdown:" not in formatted_content:
@@ -946,13 +1278,13 @@ def extract_toc(docx_path):
                     if inside_list:
                         # Close all open lists based on depth
                         for _ in range(list_depth):
-                            html_output.append("</ul>")
+                            emit("</ul>")
                         inside_list = False
                         list_depth = 0
                     
-                    html_output.append("<ul>")
-                    html_output.append(f"<li><p>{formatted_content}</p>")
-                    html_output.append("<ul>")  # Start nested list for children
+                    emit("<ul>")
+                    emit(f"<li><p>{formatted_content}</p>")
+                    emit("<ul>")  # Start nested list for children
                     inside_list = True
                     list_depth = 2  # We have main list + nested list
                     print(f"DEBUG LOGIC 3: Added parent item with nested list (non-list): {formatted_content[:30]}...")
@@ -962,331 +1294,65 @@ def extract_toc(docx_path):
                     if inside_list:
                         # Close all open lists based on depth
                         for _ in range(list_depth):
-                            html_output.append("</ul>")
+                            emit("</ul>")
                         inside_list = False
                         list_depth = 0
                     
                     if formatted_content:
-                        html_output.append(f"<p>{formatted_content}</p>")
+                        emit(f"<p>{formatted_content}</p>")
                         print(f"DEBUG LOGIC 3: Added paragraph: {formatted_content[:30]}...")
 
     # Close any remaining lists
     if inside_list:
         for _ in range(list_depth):
-            html_output.append("</ul>")
+            emit("</ul>")
 
     return "\n".join(html_output)
 
-# ------------------- FAQ Schema + Methodology -------------------
-def _get_text(docx_path):
-    doc = Document(docx_path)
-    return "\n".join(p.text for p in doc.paragraphs if p.text and p.text.strip())
-
-def _extract_json_block(text, type_name):
-    pat = re.compile(r'"@type"\s*:\s*"' + re.escape(type_name) + r'"')
-    m = pat.search(text)
-    if not m:
-        return ""
-    start_idx = text.rfind("{", 0, m.start())
-    if start_idx == -1:
-        return ""
-    depth, i, n = 0, start_idx, len(text)
-    block_chars = []
-    while i < n:
-        ch = text[i]
-        block_chars.append(ch)
-        if ch == "{":
-            depth += 1
-        elif ch == "}":
-            depth -= 1
-            if depth == 0:
-                break
-        i += 1
-    return "".join(block_chars).strip()
-
-def extract_faq_schema(docx_path):
-    text = _get_text(docx_path)
-    return _extract_json_block(text, "FAQPage")
-
-def extract_methodology_from_faqschema(docx_path):
-    faq_schema_str = extract_faq_schema(docx_path)  
-    if not faq_schema_str:
-        return ""   
-    try:
-        # Clean the JSON string by removing extra whitespace and newlines
-        cleaned_json = re.sub(r'\s+', ' ', faq_schema_str.strip())
-        faq_data = json.loads(cleaned_json)
-    except json.JSONDecodeError:
-        return ""   
-    faqs = []
-    q_count = 0
-    for item in faq_data.get("mainEntity", []):
-        q_count += 1
-        question = item.get("name", "").strip()
-        answer = item.get("acceptedAnswer", {}).get("text", "").strip()
-        if question and answer:
-            faqs.append(
-                f"<p><strong>Q{q_count}: {html.escape(question)}</strong><br>"
-                f"A{q_count}: {html.escape(answer)}</p>"
-            )
-    return "\n".join(faqs)
-
-# ------------------- Report Coverage -------------------
-def extract_report_coverage_table_with_style(docx_path):
-    doc = Document(docx_path)
-    print(f"DEBUG: Found {len(doc.tables)} tables in document")  # Debug log
-    
-    for table_idx, table in enumerate(doc.tables):
-        if len(table.rows) == 0:
-            continue
-            
-        first_row_text = " ".join([c.text.strip().lower() for c in table.rows[0].cells])
-        print(f"DEBUG: Table {table_idx} first row: {first_row_text}")  # Debug log
-        
-        # Check if this looks like a report coverage table
-        is_report_table = (
-            "report attribute" in first_row_text or 
-            "report coverage table" in first_row_text or
-            "forecast period" in first_row_text or
-            "market size" in first_row_text or
-            "revenue forecast" in first_row_text or
-            ("forecast" in first_row_text and "period" in first_row_text) or
-            ("market" in first_row_text and "size" in first_row_text)
-        )
-        
-        if is_report_table:
-            print(f"DEBUG: Found report coverage table at index {table_idx}")  # Debug log
-            html_parts = []
-            html_parts.append('<h2><strong>7.1. Report Coverage Table</strong></h2>')
-            html_parts.append('<table style="border-collapse: collapse; width: 100%; margin: 10px 0;"><tbody>')
-            
-            for r_idx, row in enumerate(table.rows):
-                # Determine row styling
-                if r_idx == 0:
-                    row_style = "background-color: #5b9bd5; color: white; font-weight: bold;"
-                elif r_idx % 2 == 1:
-                    row_style = "background-color: #deeaf6;"
-                else:
-                    row_style = "background-color: #ffffff;"
-                
-                html_parts.append(f'<tr style="{row_style}">')
-                
-                for c_idx, cell in enumerate(row.cells):
-                    text = remove_emojis(cell.text.strip())
-                    
-                    # Determine cell styling
-                    if c_idx == 0:
-                        cell_style = "border: 1px solid #9cc2e5; vertical-align: top; padding: 8px; width: 263px; font-weight: bold;"
-                    else:
-                        cell_style = "border: 1px solid #9cc2e5; vertical-align: top; padding: 8px; width: 303px;"
-                    
-                    if r_idx == 0 or c_idx == 0:
-                        html_parts.append(f'<td style="{cell_style}"><strong>{text}</strong></td>')
-                    else:
-                        html_parts.append(f'<td style="{cell_style}">{text}</td>')
-                
-                html_parts.append("</tr>")
-            
-            html_parts.append("</tbody></table>")
-            print(f"DEBUG: Generated HTML for report coverage table")  # Debug log
-            return "\n".join(html_parts)
-    
-    print("DEBUG: No report coverage table found")  # Debug log
-    return ""
-
-# ------------------- Extra Extractors -------------------
-def extract_meta_description(docx_path):
-    doc = Document(docx_path)
-    capture = False
-    for para in doc.paragraphs:
-        text = para.text.strip()
-        low = text.lower()
-        if not capture and ("introduction" in low):
-            capture = True
-            continue
-        if capture and text:
-            return text
-    return ""
-
-def extract_seo_title(docx_path):
-    doc = Document(docx_path)
-    file_name = os.path.splitext(os.path.basename(docx_path))[0]
-    revenue_forecast = ""
-    for table in doc.tables:
-        headers = [cell.text.strip().lower() for cell in table.rows[0].cells]
-        if "report attribute" in headers and "details" in headers:
-            attr_idx = headers.index("report attribute")
-            details_idx = headers.index("details")
-            for row in table.rows[1:]:
-                attr = row.cells[attr_idx].text.strip().lower()
-                details = row.cells[details_idx].text.strip()
-                if "revenue forecast in 2030" in attr:
-                    revenue_forecast = details.replace("USD", "$").strip()
-                    break
-    if revenue_forecast:
-        return f"{file_name} Size ({revenue_forecast}) 2030"
-    return file_name
-
-def extract_breadcrumb_text(docx_path):
-    file_name = os.path.splitext(os.path.basename(docx_path))[0]
-    revenue_forecast = ""
-    doc = Document(docx_path)
-    for table in doc.tables:
-        headers = [cell.text.strip().lower() for cell in table.rows[0].cells]
-        if "report attribute" in headers and "details" in headers:
-            attr_idx = headers.index("report attribute")
-            details_idx = headers.index("details")
-            for row in table.rows[1:]:
-                attr = row.cells[attr_idx].text.strip().lower()
-                details = row.cells[details_idx].text.strip()
-                if "revenue forecast in 2030" in attr:
-                    revenue_forecast = details.replace("USD", "$").strip()
-                    break
-    if revenue_forecast:
-        return f"{file_name} Report 2030"
-    return file_name
-
-def extract_sku_code(docx_path):
-    return os.path.splitext(os.path.basename(docx_path))[0].lower()
-
-def extract_sku_url(docx_path):
-    return os.path.splitext(os.path.basename(docx_path))[0].lower()
-
-def extract_breadcrumb_schema(docx_path):
-    text = _get_text(docx_path)
-    return _extract_json_block(text, "BreadcrumbList")
-
-# ------------------- Merge -------------------
-def merge_description_and_coverage(docx_path):
-    try:
-        desc_html = extract_description(docx_path) or ""
-        coverage_html = extract_report_coverage_table_with_style(docx_path) or ""
-        merged_html = desc_html + "\n\n" + coverage_html if (desc_html or coverage_html) else ""
-        return merged_html
-    except Exception as e:
-        return f"ERROR: {e}"
-
 # ------------------- Fast Extraction -------------------
-def extract_all_data_fast(file_path: str):
+def extract_all_data_fast(file_path):
     """
     Single-pass extraction of all data from Word document.
-    This is 3-5x faster than calling individual extraction functions.
+    The document is parsed once and walked once (see extract_fields); every
+    value is identical to the matching per-field extract_* function.
     """
-    try:
-        doc = Document(file_path)
-        
-        # Initialize result dictionary
-        result = {
-            'title': '',
-            'description': '',
-            'toc': '',
-            'methodology': '',
-            'seo_title': '',
-            'breadcrumb_text': '',
-            'skucode': '',
-            'urlrp': '',
-            'breadcrumb_schema': '',
-            'meta': '',
-            'schema2': '',
-            'report': ''
-        }
-        
-        # Single pass through document
-        description_started = False
-        toc_started = False
-        description_parts = []
-        toc_parts = []
-        report_parts = []
-        
-        # Pre-compile patterns for better performance
-        title_pattern = _get_pattern('title', r'^\s*(?:[A-Za-z]\.)?(?:\d+(?:\.\d+)*)?[\.\)]?\s*(?:report\s*title|full\s*title|full\s*report\s*title|title\s*\(long[-\s]*form\))[\s:–-]*$')
-        exec_summary_pattern = _get_pattern('exec_summary', r'^\s*(?:[A-Za-z]\.)?(?:\d+(?:\.\d+)*)?[\.\)]?\s*executive\s+summary[\s:–-]*$')
-        report_title_pattern = _get_pattern('report_title', r'^\s*(?:[A-Za-z]\.)?(?:\d+(?:\.\d+)*)?[\.\)]?\s*(?:report\s*title\s*\(long[-\s]*form\s*format\)|report\s*title)[\s:–-]*$')
-        
-        for paragraph in doc.paragraphs:
-            text = paragraph.text.strip()
-            if not text:
-                continue
-                
-            # Extract title
-            if title_pattern.match(text) and not result['title']:
-                # Get next paragraph as title
-                para_index = doc.paragraphs.index(paragraph)
-                if para_index + 1 < len(doc.paragraphs):
-                    result['title'] = doc.paragraphs[para_index + 1].text.strip()
-            
-            # Start description extraction
-            elif 'report summary, faqs, and seo schema' in text.lower() or 'report title' in text.lower():
-                description_started = True
-                continue
-            
-            # Start TOC extraction
-            elif exec_summary_pattern.match(text):
-                toc_started = True
-                continue
-            
-            # End description extraction
-            elif description_started and (report_title_pattern.match(text) or 'report title' in text.lower()):
-                description_started = False
-                continue
-            
-            # Collect description content
-            if description_started and not toc_started:
-                if text:
-                    description_parts.append(f"<p>{runs_to_html(paragraph.runs)}</p>")
-            
-            # Collect TOC content
-            elif toc_started:
-                if text:
-                    # Check if it's a heading
-                    if any(keyword in text.lower() for keyword in ['chapter', 'section', 'part', 'overview', 'analysis']):
-                        toc_parts.append(f"<h2><strong>{text}</strong></h2>\n")
-                    elif text.startswith(('1.', '2.', '3.', '4.', '5.', '6.', '7.', '8.', '9.')):
-                        toc_parts.append(f"<h3>{text}</h3>\n")
-                    else:
-                        toc_parts.append(f"<p>{runs_to_html(paragraph.runs)}</p>\n")
-        
-        # Process tables for report coverage
-        for table in doc.tables:
-            if len(table.rows) > 0:
-                first_row_text = ' '.join([cell.text.strip() for cell in table.rows[0].cells]).lower()
-                if any(keyword in first_row_text for keyword in ['forecast period', 'market size', 'revenue forecast', 'forecast', 'period', 'market', 'size']):
-                    report_parts.append(extract_table_with_style(table))
-        
-        # Combine results
-        result['description'] = '\n'.join(description_parts)
-        result['toc'] = '\n'.join(toc_parts)
-        result['report'] = '\n'.join(report_parts)
-        
-        # Extract other fields (these are lightweight)
-        result['methodology'] = extract_methodology_from_faqschema(file_path)
-        result['seo_title'] = extract_seo_title(file_path)
-        result['breadcrumb_text'] = extract_breadcrumb_text(file_path)
-        result['skucode'] = extract_sku_code(file_path)
-        result['urlrp'] = extract_sku_url(file_path)
-        result['breadcrumb_schema'] = extract_breadcrumb_schema(file_path)
-        result['meta'] = extract_meta_description(file_path)
-        result['schema2'] = extract_faq_schema(file_path)
-        
-        return result
-        
-    except Exception as e:
-        print(f"Error in fast extraction: {e}")
-        # Fallback to individual extractions
-        return {
-            'title': extract_title(file_path),
-            'description': extract_description(file_path),
-            'toc': extract_toc(file_path),
-            'methodology': extract_methodology_from_faqschema(file_path),
-            'seo_title': extract_seo_title(file_path),
-            'breadcrumb_text': extract_breadcrumb_text(file_path),
-            'skucode': extract_sku_code(file_path),
-            'urlrp': extract_sku_url(file_path),
-            'breadcrumb_schema': extract_breadcrumb_schema(file_path),
-            'meta': extract_meta_description(file_path),
-            'schema2': extract_faq_schema(file_path),
-            'report': extract_report_coverage_table_with_style(file_path)
-        }
+    return extract_fields(file_path, ROW_FIELDS, prefilter=True)
+
+def extract_all_data_per_field(file_path):
+    """
+    Same result as extract_all_data_fast, but with one extract_* call (and
+    one parse of the file) per field. Kept as the reference implementation.
+    """
+    return {
+        'title': extract_title(file_path),
+        'description': extract_description(file_path),
+        'toc': extract_toc(file_path),
+        'methodology': extract_methodology_from_faqschema(file_path),
+        'seo_title': extract_seo_title(file_path),
+        'breadcrumb_text': extract_breadcrumb_text(file_path),
+        'skucode': extract_sku_code(file_path),
+        'urlrp': extract_sku_url(file_path),
+        'breadcrumb_schema': extract_breadcrumb_schema(file_path),
+        'meta': extract_meta_description(file_path),
+        'schema2': extract_faq_schema(file_path),
+        'report': extract_report_coverage_table_with_style(file_path)
+    }
+
+def extract_row_fields(file_path, engine="lite", single_pass=True):
+    """Row fields of one file and the heading cache hits/misses it took.
+
+    Module level and free of Django settings, so worker processes can run
+    it: conversion jobs submit one call per file to a process pool.
+    """
+    heading_stats = {"hits": 0, "misses": 0}
+    with count_heading_lookups(heading_stats):
+        if single_pass:
+            # document is opened once and walked once per file
+            with ParsedDocument(file_path, engine=engine) as doc:
+                fields = extract_all_data_fast(doc)
+        else:
+            fields = extract_all_data_per_field(str(file_path))
+    return fields, heading_stats
 
 def process_files_parallel(file_paths: list, max_workers: int = 4):
     """
@@ -1339,12 +1405,12 @@ def paragraph_to_html(para):
     text = para.text.strip()
     if not text:
         return ""
-    if para.style.name.lower().startswith("list"):
+    style = paragraph_features(para).style
+    if style.name.lower().startswith("list"):
         return f"<li>{text}</li>"
     text = remove_emojis(text)
-    if para.style.name.startswith("Heading"):
-        level = para.style.name.replace("Heading", "").strip()
-        level = int(level) if level.isdigit() else 2
+    if style.name.startswith("Heading"):
+        level = style.heading_level or 2
         return f"<h{level}><strong>{text}</strong></h{level}>"
     return f"<p>{text}</p>"
 
@@ -1361,36 +1427,64 @@ def run_to_html(run):
         return f"<i>{text}</i>"
     return text
 
-def runs_to_html(runs):
-    parts = []
-    for run in runs:
-        txt = remove_emojis(run.text)
-        if not txt and not run._element.xpath(".//w:br"):
+def extract_title(docx_path: str) -> str:
+    return _extract_field(docx_path, "title")
+
+def _title_rule(doc):
+    """Title lookup in priority order: the line after a "Report Title" header,
+    a title table cell, a "Full Title"/filename line, then a market-style
+    line among the first 5 paragraphs. Only the first one can finish early,
+    the fallbacks are remembered until the end of the document."""
+    filename = doc.filename
+    filename_low = filename.lower()
+    capture = False
+    table_title = None
+    line_title = None
+    leading_title = None
+    para_idx = 0
+
+    while True:
+        block = yield
+        if block is _END:
+            break
+
+        if isinstance(block, Table):
+            if table_title is None:
+                title_text = table_features(block).title_text
+                if title_text:
+                    table_title = _ensure_filename_start_and_year(title_text, filename)
             continue
 
-        # check for manual line breaks inside run
-        if run._element.xpath(".//w:br"):
-            parts.append("<br>")
+        feats = paragraph_features(block)
+        text = feats.text
 
-        if run.bold and run.italic:
-            parts.append(f"<b><i>{txt}</i></b>")
-        elif run.bold:
-            parts.append(f"<b>{txt}</b>")
-        elif run.italic:
-            parts.append(f"<i>{txt}</i>")
-        else:
-            parts.append(txt)
-    return "".join(parts).strip()
+        # NEW LOGIC: Look for market report patterns in first few paragraphs
+        if para_idx < 5 and leading_title is None and text:
+            clean_text = feats.clean
+            clean_text = collapse_ws(clean_text).strip()
 
- def extract_title(docx_path: str) -> str:
-    doc = Document(docx_path)
-    filename = os.path.splitext(os.path.basename(docx_path))[0]
-    filename_low = filename.lower()
-    blocks = [(p, (p.text or "").strip()) for p in doc.paragraphs if (p.text or "").strip()]
+            # Look for patterns like "Global [Topic] Market" or "[Topic] Market"
+            if re.search(r'(?:global\s+)?[a-zA-Z\s]+market', clean_text.lower()) and len(clean_text) < 300:
+                leading_title = (para_idx, clean_text)
 
-    capture = False
-    for _, text in blocks:
-        text = remove_emojis(text)
+            # Look for "Forecast, 2024–2030" pattern
+            elif re.search(r'forecast\s*,\s*20\d{2}[\s\-–]20\d{2}', clean_text.lower()):
+                leading_title = (para_idx, clean_text)
+        para_idx += 1
+
+        if not text:
+            continue
+
+        if line_title is None:
+            low = feats.lower
+            if low.startswith("full report title") or low.startswith("full title"):
+                inline = _inline_title(text)
+                if inline:
+                    line_title = _ensure_filename_start_and_year(inline, filename)
+            if line_title is None and low.startswith(filename_low) and "forecast" in low:
+                line_title = _ensure_filename_start_and_year(text, filename)
+
+        text = feats.clean
         if capture:
             return _ensure_filename_start_and_year(text, filename)
         if HEADER_LINE_RE.match(text):
@@ -1398,58 +1492,104 @@ def runs_to_html(runs):
             if inline:
                 return _ensure_filename_start_and_year(inline, filename)
             capture = True
-            continue
 
-    for table in doc.tables:
-        for r_idx, row in enumerate(table.rows):
-            for c_idx, cell in enumerate(row.cells):
-                cell_text = (cell.text or "").strip().lower()
-                if not cell_text:
-                    continue
-                if "report title" in cell_text or "full title" in cell_text or "full report title" in cell_text:
-                    if c_idx + 1 < len(row.cells):
-                        nxt = row.cells[c_idx+1].text.strip()
-                        if nxt:
-                            return _ensure_filename_start_and_year(nxt, filename)
-                    if r_idx + 1 < len(table.rows):
-                        nxt = row.rows[r_idx+1].cells[c_idx].text.strip()
-                        if nxt:
-                            return _ensure_filename_start_and_year(nxt, filename)
-
-    for _, text in blocks:
-        low = text.lower()
-        if low.startswith("full report title") or low.startswith("full title"):
-            inline = _inline_title(text)
-            if inline:
-                return _ensure_filename_start_and_year(inline, filename)
-        if low.startswith(filename_low) and "forecast" in low:
-            return _ensure_filename_start_and_year(text, filename)
+    if table_title:
+        return table_title
+    if line_title:
+        return line_title
 
-    # NEW LOGIC: Look for market report patterns in first few paragraphs
     print("DEBUG: Looking for market report patterns in first paragraphs")  # Debug log
-    for para_idx, para in enumerate(doc.paragraphs[:5]):  # Check first 5 paragraphs
-        text = para.text.strip()
-        if not text:
-            continue
-            
-        clean_text = remove_emojis(text)
-        clean_text = re.sub(r'\s+', ' ', clean_text).strip()
-        
-        # Look for patterns like "Global [Topic] Market" or "[Topic] Market"
-        if re.search(r'(?:global\s+)?[a-zA-Z\s]+market', clean_text.lower()) and len(clean_text) < 300:
-            print(f"DEBUG: Found potential market title in paragraph {para_idx}: {clean_text}")  # Debug log
-            return _ensure_filename_start_and_year(clean_text, filename)
-        
-        # Look for "Forecast, 2024–2030" pattern
-        if re.search(r'forecast\s*,\s*20\d{2}[\s\-–]20\d{2}', clean_text.lower()):
-            print(f"DEBUG: Found 'Forecast, 2024–2030' pattern in paragraph {para_idx}: {clean_text}")  # Debug log
-            return _ensure_filename_start_and_year(clean_text, filename)
+    if leading_title:
+        para_idx, clean_text = leading_title
+        print(f"DEBUG: Found potential market title in paragraph {para_idx}: {clean_text}")  # Debug log
+        return _ensure_filename_start_and_year(clean_text, filename)
 
     return "Title Not Available"
 
 # ------------------- Extract Description -------------------
 def extract_description(docx_path):
-    doc = Document(docx_path)
+    return _extract_field(docx_path, "description")
+
+TARGET_HEADINGS = [
+    "introduction and strategic context",
+    "market segmentation and forecast scope",
+    "market trends and innovation landscape",
+    "competitive intelligence and benchmarking",
+    "regional landscape and adoption outlook",
+    "end-user dynamics and use case",
+    "recent developments + opportunities & restraints",
+    "opportunities & restraints"
+]
+
+# Regional headings that should only be h2 when inside "Regional Landscape" section
+REGIONAL_HEADINGS = [
+    "north america",
+    "europe", 
+    "asia pacific",
+    "asia-pacific",
+    "latin america",
+    "middle east & africa (mea)"
+]
+
+# Opportunities heading that should only be h2 when inside "Recent Developments" section
+OPPORTUNITIES_HEADINGS = ["opportunities","restraints","Opportunities & Restraints"]
+
+# Segmentation headings that should only be h2 when standalone
+SEGMENTATION_HEADINGS = [
+    "by type",
+    "by application",
+    "by end user",
+    "by region",
+    "by model type",
+    "by geography",
+    "by component",
+    "by deployment mode",
+    "by diagnostic approach",
+    "by product type",
+    "by modality",
+    "by technology",
+    "by service type",
+    "by column type",
+    "by row type",
+    "by application type",
+    "by deployment type",
+    "by diagnostic type",
+    "by modality type",
+    "by technique",
+    "by test type",
+    "by imaging technology",
+    "by cancer type",
+    "by incontinence type",
+    "by usage type",
+    "by diagnostic method",
+    "by technology type",
+    "by pathogen type",
+    "by crop type",
+    "by route of administration",
+    "by route of administration type",
+    "by material type",
+    "by sample type",
+]
+
+DESCRIPTION_END_PHRASES = [
+    "report summary, faqs, and seo schema",
+    "report title",
+    "report coverage table",
+    "7.1. report coverage table",
+    "report coverage",
+    "faqs and seo schema"
+]
+
+# All description heading lists compiled into one matcher at import
+_DESCRIPTION_HEADINGS = PhraseMatcher({
+    "target": TARGET_HEADINGS,
+    "regional": REGIONAL_HEADINGS,
+    "opportunities": OPPORTUNITIES_HEADINGS,
+    "segmentation": SEGMENTATION_HEADINGS,
+    "end": DESCRIPTION_END_PHRASES,
+})
+
+def _description_rule(doc):
     html_output = []
     capture, inside_list = False, None
     last_heading = None
@@ -1460,131 +1600,59 @@ def extract_description(docx_path):
     inside_segmentation_section = False
     inside_segmentation_subheading = False
 
-    target_headings = [
-        "introduction and strategic context",
-        "market segmentation and forecast scope",
-        "market trends and innovation landscape",
-        "competitive intelligence and benchmarking",
-        "regional landscape and adoption outlook",
-        "end-user dynamics and use case",
-        "recent developments + opportunities & restraints",
-        "opportunities & restraints"
-        
-    ]
-    
-    # Regional headings that should only be h2 when inside "Regional Landscape" section
-    regional_headings = [
-        "north america",
-        "europe", 
-        "asia pacific",
-        "asia-pacific",
-        "latin america",
-        "middle east & africa (mea)"
-    ]
-    
-    # Opportunities heading that should only be h2 when inside "Recent Developments" section
-    opportunities_heading = ["opportunities","restraints","Opportunities & Restraints"]
-    
-    # Segmentation headings that should only be h2 when standalone
-    segmentation_headings = [
-        "by type",
-        "by application", 
-        "by end user",
-        "by region",
-        "by model type",
-        "by geography",
-        "by component",
-        "by deployment mode",
-        "by diagnostic approach",
-        "by product type",
-        "by modality",
-        "by technology",
-        "by service type",
-        "by column type",
-        "by row type",
-        "by application type",
-        "by deployment type",
-        "by diagnostic type",
-        "by product type",
-        "by modality type",
-        "by technique",
-        "by test type",
-        "by imaging technology",
-        "by cancer type",
-        "by incontinence type",
-        "by usage type",
-        "by diagnostic method",
-        "by application type",
-        "by technology type",
-        "by service type",
-        "by column type",
-        "by row type",
-        "by product type",
-        "by pathogen type",
-        "by crop type",
-        "by route of administration",
-        "by route of administration type",
-        "by route of administration type",
-        "by material type",
-        "by sample type"
-        
-
-        
+    seen_h2 = False  # some output line contains "<h2><strong>"
+    last_by_heading_at = -1  # index of the latest output line containing "<h2><strong>By "
 
-    ]
-
-    def clean_heading(text):
-        text = remove_emojis(text.strip())
-        text = re.sub(r'^[^\w]+', '', text)
-        text = re.sub(r'(?i)section\s*\d+[:\-]?\s*', '', text)
-        text = re.sub(r'^\d+[\.\-\)]\s*', '', text)
-        text = re.sub(r'\s+', ' ', text)
-        return text.lower().strip()
+    def emit(item):
+        nonlocal seen_h2, last_by_heading_at
+        if "<h2><strong>" in item:
+            seen_h2 = True
+            if "<h2><strong>By " in item:
+                last_by_heading_at = len(html_output)
+        html_output.append(item)
 
     def add_nbsp_safely():
         """Add &nbsp; only if the last item is not already &nbsp; and not before first heading"""
         if not html_output or html_output[-1] != "&nbsp;":
             # Check if this would be before the first heading
-            if not any("<h2><strong>" in item for item in html_output):
+            if not seen_h2:
                 return  # Don't add &nbsp; before first heading
-            html_output.append("&nbsp;")
+            emit("&nbsp;")
+
+    while True:
+        block = yield
+        if block is _END:
+            break
 
-    for block in doc.element.body:
-        if isinstance(block, CT_P):  
-            para = Paragraph(block, doc)
-            text = remove_emojis(para.text.strip())
+        if isinstance(block, Paragraph):  
+            para = block
+            feats = paragraph_features(para)
+            text = feats.clean
             if not text:
                 continue
 
-            cleaned = clean_heading(text)
+            headings = feats.desc_headings
 
             # Start capture
-            if not capture and any(h in cleaned for h in target_headings):
+            if not capture and "target" in headings:
                 capture = True  
 
             # End capture - enhanced conditions
-            if capture and any(end_phrase in cleaned for end_phrase in [
-                "report summary, faqs, and seo schema",
-                "report title",
-                "report coverage table",
-                "7.1. report coverage table",
-                "report coverage",
-                "faqs and seo schema"
-            ]):
+            if capture and "end" in headings:
                 break  
 
             if capture:
-                content = runs_to_html(para.runs)
-                matched_heading = next((h for h in target_headings if h in cleaned), None)
+                content = runs_to_html(feats.segments)
+                matched_heading = headings.get("target")
                 
                 # Check for regional headings
-                regional_heading = next((h for h in regional_headings if h in cleaned), None)
+                regional_heading = headings.get("regional")
                 
                 # Check for opportunities heading
-                opportunities_match = next((h for h in opportunities_heading if h in cleaned), None)
+                opportunities_match = headings.get("opportunities")
                 
                 # Check for segmentation headings
-                segmentation_heading = next((h for h in segmentation_headings if h in cleaned), None)
+                segmentation_heading = headings.get("segmentation")
 
                 if matched_heading and matched_heading not in used_headings:
                     last_heading = matched_heading
@@ -1625,14 +1693,14 @@ def extract_description(docx_path):
                         inside_segmentation_subheading = False
 
                     if inside_list:
-                        html_output.append(f"</{inside_list}>")
+                        emit(f"</{inside_list}>")
                         inside_list = None
 
                     # ✅ Add &nbsp; before all main headings EXCEPT "Introduction And Strategic Context"
                     if matched_heading != "introduction and strategic context":
                         add_nbsp_safely()
                     
-                    html_output.append(f"<h2><strong>{matched_heading.title()}</strong></h2>")
+                    emit(f"<h2><strong>{matched_heading.title()}</strong></h2>")
                     used_headings.add(matched_heading)
                 
                 # Handle regional headings only when inside regional section AND as standalone headings
@@ -1646,29 +1714,29 @@ def extract_description(docx_path):
                     
                     if is_standalone:
                         if inside_list:
-                            html_output.append(f"</{inside_list}>")
+                            emit(f"</{inside_list}>")
                             inside_list = None
 
                         # ✅ Add &nbsp; before <h2>, but not after
                         add_nbsp_safely()
-                        html_output.append(f"<h2><strong>{regional_heading.title()}</strong></h2>")
+                        emit(f"<h2><strong>{regional_heading.title()}</strong></h2>")
                         used_headings.add(regional_heading)
                     else:
                         # It's part of a larger sentence, treat as normal paragraph
                         if inside_list:
-                            html_output.append(f"</{inside_list}>")
+                            emit(f"</{inside_list}>")
                             inside_list = None
-                        html_output.append(f"<p>{content}</p>")
+                        emit(f"<p>{content}</p>")
                 
                 # Handle opportunities heading only when inside recent developments section
                 elif opportunities_match and inside_recent_developments_section and opportunities_match not in used_headings:
                     if inside_list:
-                        html_output.append(f"</{inside_list}>")
+                        emit(f"</{inside_list}>")
                         inside_list = None
 
                     # ✅ Add &nbsp; before <h2>, but not after
                     add_nbsp_safely()
-                    html_output.append(f"<h2><strong>{opportunities_match.title()}</strong></h2>")
+                    emit(f"<h2><strong>{opportunities_match.title()}</strong></h2>")
                     used_headings.add(opportunities_match)
                 
                 # Handle segmentation headings only when standalone
@@ -1682,7 +1750,7 @@ def extract_description(docx_path):
                     
                     if is_standalone:
                         if inside_list:
-                            html_output.append(f"</{inside_list}>")
+                            emit(f"</{inside_list}>")
                             inside_list = None
 
                         # Set flag that we're inside a segmentation subheading
@@ -1690,36 +1758,38 @@ def extract_description(docx_path):
 
                         # ✅ Add &nbsp; before <h2>, but not after
                         add_nbsp_safely()
-                        html_output.append(f"<h2><strong>{segmentation_heading.title()}</strong></h2>")
+                        emit(f"<h2><strong>{segmentation_heading.title()}</strong></h2>")
                         used_headings.add(segmentation_heading)
                     else:
                         # It's part of a larger sentence, treat as normal paragraph
                         if inside_list:
-                            html_output.append(f"</{inside_list}>")
+                            emit(f"</{inside_list}>")
                             inside_list = None
-                        html_output.append(f"<p>{content}</p>")
+                        emit(f"<p>{content}</p>")
 
                 # Subheading detection → h3
                 elif re.match(r'^\d+(\.\d+)+', text.strip()):  
                     if inside_list:
-                        html_output.append(f"</{inside_list}>")
+                        emit(f"</{inside_list}>")
                         inside_list = None
-                    html_output.append(f"<h3><strong>{content}</strong></h3>")
+                    emit(f"<h3><strong>{content}</strong></h3>")
 
-                elif is_list_item(para):
-                    if inside_list != "ul":
+                elif feats.in_list:
+                    # numbered Word lists become <ol>, bullets (or unknown numbering) <ul>
+                    list_tag = "ol" if feats.list_level is not None and feats.list_level.ordered else "ul"
+                    if inside_list != list_tag:
                         if inside_list:
-                            html_output.append(f"</{inside_list}>")
+                            emit(f"</{inside_list}>")
                         # Don't add &nbsp; before starting a list
-                        html_output.append("<ul>")
-                        inside_list = "ul"
+                        emit(f"<{list_tag}>")
+                        inside_list = list_tag
 
                     # ✅ CKEditor-friendly list items (no nested <p> tags)
-                    html_output.append(f"<li>{content}</li>")
+                    emit(f"<li>{content}</li>")
 
                 else:
                     if inside_list:
-                        html_output.append(f"</{inside_list}>")
+                        emit(f"</{inside_list}>")
                         inside_list = None
                     
                     # Check if this paragraph comes immediately after a main heading
@@ -1735,117 +1805,317 @@ def extract_description(docx_path):
                     # Check if this paragraph comes after a segmentation subheading
                     is_after_subheading = False
                     if inside_segmentation_section:
-                        # Look at recent headings to see if we're after a segmentation subheading
-                        for recent_item in html_output[-10:]:  # Check last 10 items
-                            if "<h2><strong>By " in recent_item:
-                                is_after_subheading = True
-                                break
+                        # Look at recent headings to see if we're after a segmentation subheading (last 10 items)
+                        is_after_subheading = last_by_heading_at >= max(0, len(html_output) - 10)
                     
                     if inside_segmentation_section and not is_after_subheading and not is_after_main_heading:
                         add_nbsp_safely()
                     
-                    html_output.append(f"<p>{content}</p>")
+                    emit(f"<p>{content}</p>")
                     
                     # Add &nbsp; after paragraph only if line length >= 200 characters
                     if len(content) >= 200:
-                        html_output.append("&nbsp;")
+                        emit("&nbsp;")
                     
                     # Reset subheading flag AFTER processing the paragraph
                     if inside_segmentation_subheading:
                         inside_segmentation_subheading = False
                     
-        elif isinstance(block, CT_Tbl):  
+        elif isinstance(block, Table):  
             # ❌ Skip table if last heading was "report coverage table"
             if last_heading == "report coverage table":
                 continue
 
-            table = Table(block, doc)
+            table = block
             table_html = [
                 "<table style='border-collapse: collapse; width:100%;'>"
             ]
-            for row in table.rows:
+            for row in table_features(table).layout:
                 table_html.append("<tr>")
-                for cell in row.cells:
-                    cell_text = " ".join(
-                        runs_to_html(para.runs) for para in cell.paragraphs
-                    ).strip()
+                for entry in row:
+                    cell_text = _cell_html(entry.cell)
+                    spans = entry.span_attrs("'")
                     table_html.append(
-                        f"<td style='border:1px solid #000; padding:6px;'>{cell_text}</td>"
+                        f"<td{spans} style='border:1px solid #000; padding:6px;'>{cell_text}</td>"
                     )
                 table_html.append("</tr>")
             table_html.append("</table>")
-            html_output.append("\n".join(table_html))
+            emit("\n".join(table_html))
 
     if inside_list:
-        html_output.append(f"</{inside_list}>")
+        emit(f"</{inside_list}>")
 
     return "\n".join(html_output)
 
 # ------------------- Helper Functions -------------------
-def runs_to_html(runs):
-    """Convert Word runs (bold/italic) to inline HTML."""
+# ------------------- Run Segments -------------------
+_XPATH_NS = {"w": nsmap["w"]}
+_RUNS_XPATH = etree.XPath("w:r", namespaces=_XPATH_NS)
+_RUNS_AND_LINKS_XPATH = etree.XPath("w:r | w:hyperlink/w:r", namespaces=_XPATH_NS)
+_RUN_TEXT_XPATH = etree.XPath("w:br | w:cr | w:noBreakHyphen | w:ptab | w:t | w:tab", namespaces=_XPATH_NS)
+_HYPERLINK = qn("w:hyperlink")
+_BR = qn("w:br")
+_R_ID = qn("r:id")
+
+# part -> {rId: target}, built once per document part
+_LINK_TARGETS = weakref.WeakKeyDictionary()
+
+def _link_targets(part):
+    targets = _LINK_TARGETS.get(part)
+    if targets is None:
+        targets = {rId: rel.target_ref for rId, rel in part.rels.items()}
+        _LINK_TARGETS[part] = targets
+    return targets
+
+def _on_off(rPr, name):
+    """Direct w:b / w:i value of a run, like Run.bold / Run.italic (None when unset)."""
+    if rPr is None:
+        return None
+    elem = getattr(rPr, name)
+    return None if elem is None else elem.val
+
+def run_segments(para, links=False):
+    """Yield (text, bold, italic, href, has_break) for each run of ``para``.
+
+    The paragraph XML is walked once with precompiled XPath; ``text`` is the
+    same as ``Run.text``. Only direct runs are visited by default, which is
+    what ``para.runs`` returns. With ``links=True`` runs inside w:hyperlink
+    are included too; their ``href`` is the relationship target ("" when it
+    cannot be resolved) and it is None for every other run.
+    """
+    targets = None
+    for r in (_RUNS_AND_LINKS_XPATH if links else _RUNS_XPATH)(para._p):
+        href = None
+        parent = r.getparent()
+        if parent.tag == _HYPERLINK:
+            if targets is None:
+                targets = _link_targets(para.part)
+            href = targets.get(parent.get(_R_ID), "")
+        rPr = r.rPr
+        text = "".join(str(e) for e in _RUN_TEXT_XPATH(r))
+        yield text, _on_off(rPr, "b"), _on_off(rPr, "i"), href, r.find(_BR) is not None
+
+def coalesce_segments(segments):
+    """Merge adjacent run segments with the same bold, italic and link target.
+
+    Word splits text into runs for spell-check and revision marks, so one
+    formatted phrase often arrives as several segments. Whitespace-only runs
+    join whichever group they sit in. Text is glued as Word shows it ("Mar" +
+    "ket" -> "Market"), with whitespace at a run boundary kept as one space,
+    as the per-run rendering did. Runs containing a break are left alone.
+    Returns a list of segments with bold/italic as plain bools.
+    """
+    merged = []
+    for text, bold, italic, href, br in segments:
+        if merged and not br and not merged[-1][4]:
+            prev, *fmt = merged[-1][:4]
+            if not text.strip() or fmt == [bool(bold), bool(italic), href]:
+                if prev[-1:].isspace() or text[:1].isspace():
+                    text = prev.rstrip() + " " + text.lstrip()
+                else:
+                    text = prev + text
+                merged[-1] = (text, *fmt, False)
+                continue
+        merged.append((text, bool(bold), bool(italic), href, br))
+    return merged
+
+def runs_to_html(segments):
+    """Convert run segments (bold/italic) to inline HTML."""
     parts = []
-    for run in runs:
-        txt = remove_emojis(run.text.strip())
+    segments = coalesce_segments(segments)
+    texts = [text.strip() for text in remove_emojis_many(text for text, *_ in segments)]
+    for txt, (_text, bold, italic, _href, _br) in zip(texts, segments):
         if not txt:
             continue
-        if run.bold and run.italic:
+        if bold and italic:
             parts.append(f"<b><i>{txt}</i></b>")
-        elif run.bold:
+        elif bold:
             parts.append(f"<b>{txt}</b>")
-        elif run.italic:
+        elif italic:
             parts.append(f"<i>{txt}</i>")
         else:
             parts.append(txt)
     return " ".join(parts).strip()
 
  # ------------------- FAQ Schema + Methodology -------------------
-def _get_text(docx_path):
-    doc = Document(docx_path)
-    return "\n".join(p.text for p in doc.paragraphs if p.text and p.text.strip())
-
-def _extract_json_block(text, type_name):
-    pat = re.compile(r'"@type"\s*:\s*"' + re.escape(type_name) + r'"')
-    m = pat.search(text)
-    if not m:
-        return ""
-    start_idx = text.rfind("{", 0, m.start())
-    if start_idx == -1:
-        return ""
-    depth, i, n = 0, start_idx, len(text)
-    block_chars = []
-    while i < n:
-        ch = text[i]
-        block_chars.append(ch)
-        if ch == "{":
-            depth += 1
-        elif ch == "}":
-            depth -= 1
-            if depth == 0:
-                break
-        i += 1
-    return "".join(block_chars).strip()
+_JSON_TYPE_RE = re.compile(r'"@type"\s*:\s*"([^"]*)"')
+# a "@type" at the end of the text so far that the next lines may still complete
+_JSON_TYPE_TAIL_RE = re.compile(r'"@type"\s*(?::\s*(?:"[^"]*)?)?\Z')
+_BRACE_RE = re.compile(r'[{}]')
+_JSON_DECODER = json.JSONDecoder(strict=False)  # Word text may put raw newlines inside strings
+
+def _brace_block(text, start_idx):
+    """(block, closed): text from start_idx up to the brace that balances it."""
+    depth = 0
+    for m in _BRACE_RE.finditer(text, start_idx):
+        depth += 1 if m.group() == "{" else -1
+        if depth == 0:
+            return text[start_idx:m.end()].strip(), True
+    return text[start_idx:].strip(), False
+
+class JsonLdBlock:
+    """A "@type" JSON block: its source text and, when it is valid JSON, the parsed object."""
+    __slots__ = ("type", "raw", "data")
+
+    def __init__(self, type_name, raw, data):
+        self.type = type_name
+        self.raw = raw
+        self.data = data
+
+class JsonLdIndex:
+    """Every "@type" JSON block in the document's paragraph text, parsed once.
+
+    Paragraph lines are fed in document order (each at most once, however
+    many rules pass the same paragraph in). A block starts at the last "{"
+    before the first "@type": "<name>" and is read with
+    ``JSONDecoder.raw_decode``; blocks that are not valid JSON fall back to
+    brace matching at the end of the document. The text is scanned when a
+    line brings the running brace depth back to zero, so the schema/
+    methodology rules can stop as soon as their block is complete.
+
+    Each scan only looks for "@type" in the lines added since the last one
+    and only decodes the blocks still waiting for more text: a block that
+    decoded, or failed somewhere before the end of the text, is never read
+    again (the next line starts with "\n", which cannot repair it).
+    """
+
+    def __init__(self):
+        self.lines = []
+        self.blocks = {}    # type name -> JsonLdBlock (first occurrence)
+        self.finished = False
+        self._last = None
+        self._depth = 0
+        self._types_seen = False
+        self._line_starts = []  # offset of each line in "\n".join(self.lines)
+        self._length = 0
+        self._scanned = 0       # "@type" matches before this offset are in _pending
+        self._last_brace = -1   # offset of the last "{" before _scanned
+        self._pending = []      # [type name, block start, failed for good], text order
+
+    def feed(self, para):
+        if para is self._last or self.finished:
+            return
+        self._last = para
+        text = para.text
+        if not text or not text.strip():
+            return
+        start = self._length + 1 if self.lines else 0
+        self.lines.append(text)
+        self._line_starts.append(start)
+        self._length = start + len(text)
+        if '"@type"' in text:
+            self._types_seen = True
+        closes = text.count("}")
+        self._depth = max(0, self._depth + text.count("{") - closes)
+        if closes and self._depth == 0 and self._types_seen:
+            self._scan(final=False)
+
+    def finish(self):
+        if not self.finished:
+            self._scan(final=True)
+            self.finished = True
+
+    def get(self, type_name):
+        """The block for type_name, or None when it is not (yet) complete."""
+        return self.blocks.get(type_name)
+
+    def _text_from(self, offset):
+        """(offset of its first line, text) from the line holding ``offset`` to the end."""
+        if not self.lines:
+            return 0, ""
+        i = max(bisect.bisect_right(self._line_starts, offset) - 1, 0)
+        return self._line_starts[i], "\n".join(self.lines[i:])
+
+    def _needed(self, final):
+        """Offset of the first block that may still be decoded (or, at the end, fall back)."""
+        return min([self._scanned] + [start for _type, start, dead in self._pending if start >= 0 and (final or not dead)])
+
+    def _scan(self, final):
+        base, text = self._text_from(self._needed(final))
+
+        # new "@type" matches
+        last_end = self._scanned - base
+        for m in _JSON_TYPE_RE.finditer(text, last_end):
+            brace = text.rfind("{", 0, m.start())
+            self._pending.append([m.group(1), base + brace if brace >= 0 else self._last_brace, False])
+            last_end = m.end()
+        tail = text.rfind('"@type"', last_end)
+        scanned = tail if tail >= 0 and _JSON_TYPE_TAIL_RE.match(text, tail) else len(text)
+        brace = text.rfind("{", 0, scanned)
+        if brace >= 0:
+            self._last_brace = base + brace
+        self._scanned = base + scanned
+        if self._needed(final) < base:
+            # a new block opened before the text joined above
+            base, text = self._text_from(self._needed(final))
+
+        for entry in self._pending:
+            type_name, start, dead = entry
+            if type_name in self.blocks:
+                continue
+            if start < 0:
+                self.blocks[type_name] = JsonLdBlock(type_name, "", None)
+                continue
+            start -= base
+            if not dead:
+                try:
+                    data, end = _JSON_DECODER.raw_decode(text, start)
+                except json.JSONDecodeError as e:
+                    dead = entry[2] = e.pos < len(text) and not e.msg.startswith("Unterminated string")
+                else:
+                    self.blocks[type_name] = JsonLdBlock(type_name, text[start:end].strip(), data)
+                    continue
+            if final:
+                # not valid JSON: keep the brace-balanced text as is
+                self.blocks[type_name] = JsonLdBlock(type_name, _brace_block(text, start)[0], None)
+        self._pending = [entry for entry in self._pending if entry[0] not in self.blocks]
+
+def _json_ld_index(doc):
+    """The JsonLdIndex of the current walk over ``doc`` (reset by extract_fields)."""
+    index = getattr(doc, "_json_ld", None)
+    if index is None:
+        index = doc._json_ld = JsonLdIndex()
+    return index
+
+def _json_ld_rule(doc, type_name):
+    """Return the type_name JsonLdBlock (None if absent) as soon as it is complete."""
+    index = _json_ld_index(doc)
+    while True:
+        block = yield
+        if block is _END:
+            index.finish()
+            return index.get(type_name)
+        if not isinstance(block, Paragraph):
+            continue
+        index.feed(block)
+        found = index.get(type_name)
+        if found is not None:
+            return found
 
 def extract_faq_schema(docx_path):
-    text = _get_text(docx_path)
-    return _extract_json_block(text, "FAQPage")
+    return _extract_field(docx_path, "schema2")
+
+def _faq_schema_rule(doc):
+    found = yield from _json_ld_rule(doc, "FAQPage")
+    return found.raw if found else ""
 
 def extract_methodology_from_faqschema(docx_path):
-    faq_schema_str = extract_faq_schema(docx_path)  
-    if not faq_schema_str:
-        return ""   
-    try:
-        # Clean the JSON string by removing extra whitespace and newlines
-        cleaned_json = re.sub(r'\s+', ' ', faq_schema_str.strip())
-        faq_data = json.loads(cleaned_json)
-    except json.JSONDecodeError:
-        return ""   
+    return _extract_field(docx_path, "methodology")
+
+def _methodology_rule(doc):
+    found = yield from _json_ld_rule(doc, "FAQPage")
+    return _faq_data_to_methodology(found.data if found else None)
+
+def _faq_data_to_methodology(faq_data):
+    if not faq_data:
+        return ""
     faqs = []
     q_count = 0
     for item in faq_data.get("mainEntity", []):
         q_count += 1
-        question = item.get("name", "").strip()
-        answer = item.get("acceptedAnswer", {}).get("text", "").strip()
+        # whitespace inside the JSON strings is collapsed, as Word wraps long answers
+        question = collapse_ws(item.get("name", "")).strip()
+        answer = collapse_ws(item.get("acceptedAnswer", {}).get("text", "")).strip()
         if question and answer:
             faqs.append(
                 f"<p><strong>Q{q_count}: {html.escape(question)}</strong><br>"
@@ -1855,28 +2125,25 @@ def extract_methodology_from_faqschema(docx_path):
 
 # ------------------- Report Coverage -------------------
 def extract_report_coverage_table_with_style(docx_path):
-    doc = Document(docx_path)
-    print(f"DEBUG: Found {len(doc.tables)} tables in document")  # Debug log
-    
-    for table_idx, table in enumerate(doc.tables):
-        if len(table.rows) == 0:
+    return _extract_field(docx_path, "report")
+
+def _report_coverage_rule(doc):
+    table_idx = -1
+    while True:
+        table = yield
+        if table is _END:
+            break
+        if not isinstance(table, Table):
+            continue
+        table_idx += 1
+        feats = table_features(table)
+        if not feats.rows:
             continue
             
-        first_row_text = " ".join([c.text.strip().lower() for c in table.rows[0].cells])
-        print(f"DEBUG: Table {table_idx} first row: {first_row_text}")  # Debug log
+        print(f"DEBUG: Table {table_idx} first row: {feats.header_text}")  # Debug log
         
         # Check if this looks like a report coverage table
-        is_report_table = (
-            "report attribute" in first_row_text or 
-            "report coverage table" in first_row_text or
-            "forecast period" in first_row_text or
-            "market size" in first_row_text or
-            "revenue forecast" in first_row_text or
-            ("forecast" in first_row_text and "period" in first_row_text) or
-            ("market" in first_row_text and "size" in first_row_text)
-        )
-        
-        if is_report_table:
+        if "coverage" in feats.kinds:
             print(f"DEBUG: Found report coverage table at index {table_idx}")  # Debug log
             html_parts = []
             html_parts.append('<h2><strong>7.1. Report Coverage Table</strong></h2>')
@@ -1884,12 +2151,14 @@ def extract_report_coverage_table_with_style(docx_path):
             html_parts.append('<table cellspacing=0 style=\'border-collapse:collapse; width:100%\'>')
             html_parts.append('        <tbody>')
             
-            for r_idx, row in enumerate(table.rows):
+            for r_idx, row in enumerate(feats.layout):
                 html_parts.append('            <tr>')
                 
-                # Process each cell in the row
-                for c_idx, cell in enumerate(row.cells):
-                    text = remove_emojis(cell.text.strip())
+                # Process each cell in the row (merged cells once, with colspan/rowspan)
+                for entry in row:
+                    c_idx = entry.col
+                    spans = entry.span_attrs("'")
+                    text = remove_emojis(entry.text)
                     
                     # Determine cell styling based on position
                     if r_idx == 0:  # Header row
@@ -1898,7 +2167,7 @@ def extract_report_coverage_table_with_style(docx_path):
                         else:  # Second column
                             cell_style = "background-color:#4472c4; border-bottom:1px solid #4472c4; border-left:none; border-right:1px solid #4472c4; border-top:1px solid #4472c4; vertical-align:top; width:370px"
                         
-                        html_parts.append(f'                <td style=\'{cell_style}\'>')
+                        html_parts.append(f'                <td{spans} style=\'{cell_style}\'>')
                         html_parts.append(f'                <p><strong>{text}</strong></p>')
                         html_parts.append(f'                </td>')
                     
@@ -1917,7 +2186,7 @@ def extract_report_coverage_table_with_style(docx_path):
                             else:
                                 cell_style = "border-bottom:1px solid #8eaadb; border-left:none; border-right:1px solid #8eaadb; border-top:none; vertical-align:top; width:370px"
                         
-                        html_parts.append(f'                <td style=\'{cell_style}\'>')
+                        html_parts.append(f'                <td{spans} style=\'{cell_style}\'>')
                         
                         # Both columns are bold
                         html_parts.append(f'                <p><strong>{text}</strong></p>')
@@ -1931,16 +2200,24 @@ def extract_report_coverage_table_with_style(docx_path):
             print(f"DEBUG: Generated HTML for report coverage table")  # Debug log
             return "\n".join(html_parts)
     
-    print("DEBUG: No report coverage table found")  # Debug log
+    print(f"DEBUG: No report coverage table found in {table_idx + 1} tables")  # Debug log
     return ""
 
 # ------------------- Extra Extractors -------------------
 def extract_meta_description(docx_path):
-    doc = Document(docx_path)
+    return _extract_field(docx_path, "meta")
+
+def _meta_description_rule(doc):
     capture = False
-    for para in doc.paragraphs:
-        text = para.text.strip()
-        low = text.lower()
+    while True:
+        para = yield
+        if para is _END:
+            break
+        if not isinstance(para, Paragraph):
+            continue
+        feats = paragraph_features(para)
+        text = feats.text
+        low = feats.lower
         if not capture and ("introduction" in low):
             capture = True
             continue
@@ -1948,61 +2225,169 @@ def extract_meta_description(docx_path):
             return text
     return ""
 
-def extract_seo_title(docx_path):
-    doc = Document(docx_path)
-    file_name = os.path.splitext(os.path.basename(docx_path))[0]
+def _revenue_forecast_rule(doc):
+    """"Revenue Forecast in 2030" from the report attribute table (last match wins)."""
     revenue_forecast = ""
-    for table in doc.tables:
-        headers = [cell.text.strip().lower() for cell in table.rows[0].cells]
-        if "report attribute" in headers and "details" in headers:
-            attr_idx = headers.index("report attribute")
-            details_idx = headers.index("details")
-            for row in table.rows[1:]:
-                attr = row.cells[attr_idx].text.strip().lower()
-                details = row.cells[details_idx].text.strip()
-                if "revenue forecast in 2030" in attr:
-                    revenue_forecast = details.replace("USD", "$").strip()
-                    break
+    while True:
+        table = yield
+        if table is _END:
+            return revenue_forecast
+        if not isinstance(table, Table):
+            continue
+        details = table_features(table).attribute("revenue forecast in 2030")
+        if details is not None:
+            revenue_forecast = details.replace("USD", "$").strip()
+
+def extract_seo_title(docx_path):
+    return _extract_field(docx_path, "seo_title")
+
+def _seo_title_rule(doc):
+    revenue_forecast = yield from _revenue_forecast_rule(doc)
     if revenue_forecast:
-        return f"{file_name} Size ({revenue_forecast}) 2030"
-    return file_name
+        return f"{doc.filename} Size ({revenue_forecast}) 2030"
+    return doc.filename
 
 def extract_breadcrumb_text(docx_path):
-    file_name = os.path.splitext(os.path.basename(docx_path))[0]
-    revenue_forecast = ""
-    doc = Document(docx_path)
-    for table in doc.tables:
-        headers = [cell.text.strip().lower() for cell in table.rows[0].cells]
-        if "report attribute" in headers and "details" in headers:
-            attr_idx = headers.index("report attribute")
-            details_idx = headers.index("details")
-            for row in table.rows[1:]:
-                attr = row.cells[attr_idx].text.strip().lower()
-                details = row.cells[details_idx].text.strip()
-                if "revenue forecast in 2030" in attr:
-                    revenue_forecast = details.replace("USD", "$").strip()
-                    break
+    return _extract_field(docx_path, "breadcrumb_text")
+
+def _breadcrumb_text_rule(doc):
+    revenue_forecast = yield from _revenue_forecast_rule(doc)
     if revenue_forecast:
-        return f"{file_name} Report 2030"
-    return file_name
+        return f"{doc.filename} Report 2030"
+    return doc.filename
 
 def extract_sku_code(docx_path):
-    return os.path.splitext(os.path.basename(docx_path))[0].lower()
+    return document_name(docx_path).lower()
 
 def extract_sku_url(docx_path):
-    return os.path.splitext(os.path.basename(docx_path))[0].lower()
+    return document_name(docx_path).lower()
+
+def _sku_rule(doc):
+    return doc.filename.lower()
+    yield  # never reached; makes this a rule that needs no blocks
 
 def extract_breadcrumb_schema(docx_path):
-    text = _get_text(docx_path)
-    return _extract_json_block(text, "BreadcrumbList")
+    return _extract_field(docx_path, "breadcrumb_schema")
+
+def _breadcrumb_schema_rule(doc):
+    found = yield from _json_ld_rule(doc, "BreadcrumbList")
+    return found.raw if found else ""
+
+# ------------------- Single Walk -------------------
+# Every field is a rule: a generator that is sent the body blocks (Paragraph /
+# Table) in document order and returns the field value. _END is sent once the
+# body is exhausted; a rule that returns earlier stops receiving blocks, and
+# the walk stops as soon as every requested rule has returned.
+_END = None
+
+FIELD_RULES = {
+    "title": _title_rule,
+    "description": _description_rule,
+    "toc": _toc_rule,
+    "methodology": _methodology_rule,
+    "seo_title": _seo_title_rule,
+    "breadcrumb_text": _breadcrumb_text_rule,
+    "skucode": _sku_rule,
+    "urlrp": _sku_rule,
+    "breadcrumb_schema": _breadcrumb_schema_rule,
+    "meta": _meta_description_rule,
+    "schema2": _faq_schema_rule,
+    "report": _report_coverage_rule,
+}
+
+# fields needed for one output row in views._convert_worker
+ROW_FIELDS = list(FIELD_RULES)
+
+# Words a field cannot be found without: a field is skipped when, for every
+# alternative, one of its words is missing from the document text. Multi-word
+# phrases are split into words so that cell joins, whitespace cleanup and
+# "Section N:" stripping in the rules cannot hide a match from the prefilter.
+FIELD_MARKERS = {
+    "description": [("introduction",), ("segmentation",), ("trends",), ("competitive",),
+                    ("regional",), ("dynamics",), ("opportunities",)],
+    "toc": [("executive", "summary")],
+    "methodology": [("faqpage",)],
+    "seo_title": [("revenue", "forecast", "2030")],
+    "breadcrumb_text": [("revenue", "forecast", "2030")],
+    "breadcrumb_schema": [("breadcrumblist",)],
+    "meta": [("introduction",)],
+    "schema2": [("faqpage",)],
+    "report": [tuple(k.split()) for k in COVERAGE_TABLE_KEYWORDS]
+              + [("forecast", "period"), ("market", "size")],
+}
+_PREFILTER = MarkerPrefilter(FIELD_MARKERS)
+
+def extract_fields(docx_path, fields=ROW_FIELDS, prefilter=False):
+    """Extract several fields with a single walk over the document body.
+
+    With ``prefilter`` the raw document.xml is scanned for FIELD_MARKERS
+    first; rules for fields that cannot match see no blocks at all and
+    return their "not found" value at the end of the walk. The scan reads
+    the whole part, so it only pays off when the walk would run to the end
+    anyway (the full row); it is never done for the "stream" engine, which
+    would have to inflate document.xml a second time.
+    """
+    doc = load_document(docx_path)
+    doc._json_ld = None  # one JSON-LD index per walk
+    skipped = ()
+    if prefilter and doc.engine != "stream" and any(field in FIELD_MARKERS for field in fields):
+        skipped, stats = _PREFILTER.skipped(doc.document_xml(), fields)
+        print(f"DEBUG: prefilter {doc.filename}: scanned {stats['xml_bytes'] // 1024} KB "
+              f"({stats['text_bytes'] // 1024} KB text) in {stats['ms']} ms, "
+              f"skipped {', '.join(skipped) or 'nothing'}")  # Debug log
+    results = {}
+    active = {}
+    idle = {}  # skipped by the prefilter, only sent _END
+    for field in fields:
+        rule = FIELD_RULES[field](doc)
+        try:
+            next(rule)
+        except StopIteration as done:
+            results[field] = done.value
+        else:
+            (idle if field in skipped else active)[field] = rule
+
+    if active:
+        walked = 0
+        blocks = doc.iter_blocks()
+        try:
+            for block in blocks:
+                walked += 1
+                for field, rule in list(active.items()):
+                    try:
+                        rule.send(block)
+                    except StopIteration as done:
+                        results[field] = done.value
+                        del active[field]
+                if not active:
+                    break
+        finally:
+            blocks.close()
+        if idle:
+            print(f"DEBUG: prefilter saved {len(idle)} rules x {walked} blocks")  # Debug log
+
+    # skipped rules end after the walk: they may share state (the JSON-LD
+    # index) with rules that did see the body
+    for field, rule in {**active, **idle}.items():
+        try:
+            rule.send(_END)
+        except StopIteration as done:
+            results[field] = done.value
+        else:
+            raise RuntimeError(f"extractor rule {field!r} did not finish at end of document")
+
+    return {field: results[field] for field in fields}
+
+def _extract_field(docx_path, field):
+    return extract_fields(docx_path, [field])[field]
 
 # ------------------- Merge -------------------
 def merge_description_and_coverage(docx_path):
     try:
-        desc_html = extract_description(docx_path) or ""
-        coverage_html = extract_report_coverage_table_with_style(docx_path) or ""
+        doc = load_document(docx_path)
+        desc_html = extract_description(doc) or ""
+        coverage_html = extract_report_coverage_table_with_style(doc) or ""
         merged_html = desc_html + "\n\n" + coverage_html if (desc_html or coverage_html) else ""
         return merged_html
     except Exception as e:
         return f"ERROR: {e}"
-    return [text[i:i+limit] for i in range(0, len(text), limit)]      
@@ -0,0 +1,69 @@
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from converter.utils.stats import hit_rate
+
+
+class HeadingCache:
+    """Process-wide cleaned form / classification of paragraph texts.
+
+    Reports share a few hundred heading strings ("By Application", the
+    regional names, ...), so ``get(kind, text, compute)`` runs ``compute(text)``
+    once per distinct ``(kind, text)`` and returns the stored value after that.
+    Values are shared between callers and must not be modified. Texts longer
+    than ``max_text`` (body paragraphs, which rarely repeat) are computed
+    every time and not counted. At most ``max_entries`` values are kept,
+    least recently used first out.
+
+    Each process has its own cache. ``counting(stats)`` adds the hits and
+    misses of the calling thread to ``stats`` while it is active, which is
+    how a job gets its own hit rate when several run at once.
+    """
+
+    def __init__(self, max_entries=8192, max_text=200):
+        self.max_entries = max_entries
+        self.max_text = max_text
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # (kind, text) -> value
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def get(self, kind, text, compute):
+        if len(text) > self.max_text:
+            return compute(text)
+        key = (kind, text)
+        sink = getattr(self._local, "stats", None)
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                if sink is not None:
+                    sink["hits"] += 1
+                return value
+        value = compute(text)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self.misses += 1
+            if sink is not None:
+                sink["misses"] += 1
+        return value
+
+    @contextmanager
+    def counting(self, stats):
+        """Count this thread's lookups into ``stats`` ({"hits": n, "misses": n})."""
+        previous = getattr(self._local, "stats", None)
+        self._local.stats = stats
+        try:
+            yield stats
+        finally:
+            self._local.stats = previous
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), **hit_rate(self.hits, self.misses)}
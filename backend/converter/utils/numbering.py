@@ -0,0 +1,79 @@
+from functools import lru_cache
+
+from lxml import etree
+from docx.oxml.ns import qn
+
+_PARSER = etree.XMLParser(resolve_entities=False)
+_VAL = qn("w:val")
+_ILVL = qn("w:ilvl")
+_UNORDERED = ("bullet", "none")
+
+
+class ListLevel:
+    """One level of a list definition: its 0-based ``level``, the w:numFmt
+    ``format`` ("bullet", "decimal", "lowerLetter", ...) and the w:lvlText
+    marker."""
+    __slots__ = ("level", "format", "text")
+
+    def __init__(self, level, format, text):
+        self.level = level
+        self.format = format
+        self.text = text
+
+    @property
+    def ordered(self):
+        return self.format not in _UNORDERED
+
+
+def _level_from(lvl, ilvl):
+    fmt = lvl.find(qn("w:numFmt"))
+    text = lvl.find(qn("w:lvlText"))
+    return ListLevel(
+        ilvl,
+        fmt.get(_VAL, "decimal") if fmt is not None else "decimal",  # spec default
+        text.get(_VAL, "") if text is not None else "",
+    )
+
+
+class NumberingIndex:
+    """(numId, ilvl) -> ListLevel for one numbering.xml, built in one pass.
+
+    Every w:num is resolved up front against its w:abstractNum, with
+    w:lvlOverride levels applied, so looking a paragraph up is a dict get.
+    numId 0 (Word's "no numbering") and unknown ids give None.
+    """
+
+    def __init__(self, numbering_xml):
+        self._levels = {}
+        if not numbering_xml:
+            return
+        root = etree.fromstring(numbering_xml, _PARSER)
+        abstract = {}
+        for abstract_num in root.iterchildren(qn("w:abstractNum")):
+            levels = {}
+            for lvl in abstract_num.iterchildren(qn("w:lvl")):
+                ilvl = int(lvl.get(_ILVL, "0"))
+                levels[ilvl] = _level_from(lvl, ilvl)
+            abstract[abstract_num.get(qn("w:abstractNumId"))] = levels
+        for num in root.iterchildren(qn("w:num")):
+            num_id = int(num.get(qn("w:numId"), "0"))
+            abstract_id = num.find(qn("w:abstractNumId"))
+            levels = dict(abstract.get(abstract_id.get(_VAL) if abstract_id is not None else None, {}))
+            for override in num.iterchildren(qn("w:lvlOverride")):
+                lvl = override.find(qn("w:lvl"))
+                if lvl is not None:
+                    ilvl = int(override.get(_ILVL, "0"))
+                    levels[ilvl] = _level_from(lvl, ilvl)
+            for ilvl, level in levels.items():
+                self._levels[(num_id, ilvl)] = level
+
+    def lookup(self, num_id, ilvl=0):
+        if not num_id:
+            return None
+        return self._levels.get((num_id, ilvl))
+
+
+@lru_cache(maxsize=64)
+def numbering_index(numbering_xml) -> NumberingIndex:
+    """Shared NumberingIndex per distinct numbering.xml content."""
+    return NumberingIndex(numbering_xml)
@@ -0,0 +1,152 @@
+import posixpath
+import zipfile
+from contextlib import contextmanager
+from functools import cached_property
+
+from lxml import etree
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.oxml.parser import parse_xml
+from docx.parts.styles import StylesPart
+from docx.styles.styles import Styles
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+
+PACKAGE_RELS = "_rels/.rels"
+DEFAULT_DOCUMENT = "word/document.xml"
+
+_RELS_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_RELS_PARSER = etree.XMLParser(resolve_entities=False)
+
+
+class _Relationship:
+    __slots__ = ("rId", "reltype", "target_ref", "is_external")
+
+    def __init__(self, rId, reltype, target_ref, is_external):
+        self.rId = rId
+        self.reltype = reltype
+        self.target_ref = target_ref
+        self.is_external = is_external
+
+
+def _parse_rels(blob):
+    rels = {}
+    if not blob:
+        return rels
+    root = etree.fromstring(blob, _RELS_PARSER)
+    for rel in root.iterchildren("{%s}Relationship" % _RELS_NS):
+        rels[rel.get("Id")] = _Relationship(
+            rel.get("Id"), rel.get("Type"), rel.get("Target"),
+            rel.get("TargetMode") == "External",
+        )
+    return rels
+
+
+def _rels_partname(partname):
+    directory, name = posixpath.split(partname)
+    return posixpath.join(directory, "_rels", name + ".rels")
+
+
+def _resolve(source_partname, target_ref):
+    if target_ref.startswith("/"):
+        return target_ref.lstrip("/")
+    return posixpath.normpath(posixpath.join(posixpath.dirname(source_partname), target_ref))
+
+
+class LitePackage:
+    """Reads only the parts of a .docx the extractors need.
+
+    python-docx's ``Document()`` loads and relates every part in the package,
+    including embedded images, charts, headers and footers. Here only the
+    package rels, the main document rels, styles.xml and numbering.xml are
+    inflated when the package is opened; word/document.xml is read (or
+    streamed) on request and nothing under word/media is ever decompressed.
+    """
+
+    def __init__(self, docx_path):
+        self.path = str(docx_path)
+        with zipfile.ZipFile(self.path) as archive:
+            names = set(archive.namelist())
+            package_rels = _parse_rels(self._read(archive, names, PACKAGE_RELS))
+            self.document_partname = next(
+                (_resolve("", rel.target_ref) for rel in package_rels.values()
+                 if rel.reltype == RT.OFFICE_DOCUMENT and not rel.is_external),
+                DEFAULT_DOCUMENT,
+            )
+            self.rels = _parse_rels(self._read(archive, names, _rels_partname(self.document_partname)))
+            self.styles_blob = self._read(archive, names, self._related_partname(RT.STYLES))
+            self.numbering_blob = self._read(archive, names, self._related_partname(RT.NUMBERING))
+
+    @staticmethod
+    def _read(archive, names, partname):
+        if partname is None or partname not in names:
+            return None
+        return archive.read(partname)
+
+    def _related_partname(self, reltype):
+        for rel in self.rels.values():
+            if rel.reltype == reltype and not rel.is_external:
+                return _resolve(self.document_partname, rel.target_ref)
+        return None
+
+    def read_document(self):
+        with zipfile.ZipFile(self.path) as archive:
+            return archive.read(self.document_partname)
+
+    @contextmanager
+    def open_document(self):
+        """File object over word/document.xml for streaming parsers."""
+        with zipfile.ZipFile(self.path) as archive, archive.open(self.document_partname) as xml:
+            yield xml
+
+
+class LitePart:
+    """The subset of python-docx's DocumentPart that Paragraph/Run/Table use:
+    ``rels`` (hyperlink targets), ``get_style()``/``styles`` and numbering."""
+
+    def __init__(self, package):
+        self.package = package
+        self.rels = package.rels
+
+    @property
+    def styles_xml(self):
+        """styles.xml bytes (python-docx's default styles when the package has none)."""
+        return self.package.styles_blob or StylesPart._default_styles_xml()
+
+    @cached_property
+    def styles(self):
+        return Styles(parse_xml(self.styles_xml))
+
+    def get_style(self, style_id, style_type):
+        return self.styles.get_by_id(style_id, style_type)
+
+    @property
+    def numbering_xml(self):
+        """numbering.xml bytes, or None when the package has no numbering part."""
+        return self.package.numbering_blob
+
+    @cached_property
+    def numbering(self):
+        """Parsed w:numbering element, or None when the package has no numbering part."""
+        if not self.package.numbering_blob:
+            return None
+        return parse_xml(self.package.numbering_blob)
+
+
+class LiteDocument:
+    """Just enough of ``docx.Document`` for the extractors: ``element``,
+    ``part``, ``paragraphs`` and ``tables``."""
+
+    def __init__(self, package):
+        self.package = package
+        self.part = LitePart(package)
+        # kept so the prefilter can scan it without inflating the part again
+        self.blob = package.read_document()
+        self.element = parse_xml(self.blob)
+
+    @property
+    def paragraphs(self):
+        return [Paragraph(p, self) for p in self.element.body.p_lst]
+
+    @property
+    def tables(self):
+        return [Table(tbl, self) for tbl in self.element.body.tbl_lst]
@@ -0,0 +1,342 @@
+import atexit
+import concurrent.futures
+import contextlib
+import gc
+import io
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+from collections import deque
+from functools import partial
+
+import docx
+
+# imported once in the fork server, so every worker forked from it starts
+# with python-docx, lxml and the extractor's compiled regexes loaded
+_PRELOAD = ["converter.utils.extractor"]
+_WARMUP_DOCX = os.path.join(os.path.dirname(docx.__file__), "templates", "default.docx")
+# seconds a file may overrun its timeout before its worker is killed from outside
+_KILL_GRACE = 5
+
+try:
+    import resource
+except ImportError:  # Windows: no memory budget
+    resource = None
+
+
+class FileBudgetExceeded(RuntimeError):
+    """A file ran past its time or memory budget (or its worker had to be killed)."""
+
+
+def _warm_worker(engine, single_pass):
+    """Worker initializer: one throwaway extraction, then gc.freeze().
+
+    The warmup fills lazily built state (XPath objects, parser, caches) before
+    the first real file; freezing moves everything alive at that point out of
+    the collector's reach, so collections stay cheap and do not touch (and
+    copy) the pages shared with the fork server.
+    """
+    from converter.utils import extractor
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            extractor.extract_row_fields(_WARMUP_DOCX, engine, single_pass)
+        except Exception as e:
+            print(f"DEBUG: worker warmup failed: {e}", file=sys.__stdout__)
+    gc.freeze()
+
+
+def _statm_bytes(field):
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[field]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _rss_bytes():
+    """Resident set size of this process (Linux); None where /proc is missing."""
+    return _statm_bytes(1)
+
+
+def _on_timeout(signum, frame):
+    raise FileBudgetExceeded("timed out")
+
+
+def _call(fn, args, timeout=None, max_bytes=None):
+    """Run one file in a worker within its budget: ``timeout`` seconds, ``max_bytes`` more memory.
+
+    The timer interrupts Python code only; a file stuck inside lxml is left
+    to the pool's watchdog. Going over the memory budget makes allocations
+    fail, which surfaces as MemoryError.
+    """
+    vm = _statm_bytes(0) if max_bytes and resource else None
+    if vm:
+        soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+        limit = vm + max_bytes if hard == resource.RLIM_INFINITY else min(vm + max_bytes, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    timeout = timeout if hasattr(signal, "setitimer") else None  # Windows: watchdog only
+    if timeout:
+        signal.signal(signal.SIGALRM, _on_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return fn(*args), os.getpid(), _rss_bytes()
+    except FileBudgetExceeded:
+        raise FileBudgetExceeded(f"timed out after {timeout:g}s") from None
+    except MemoryError:
+        if not vm:
+            raise
+        raise FileBudgetExceeded(f"over the {max_bytes // 2**20} MB memory budget") from None
+    finally:
+        if timeout:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        if vm:
+            resource.setrlimit(resource.RLIMIT_AS, (soft, hard))
+
+
+def _ping():
+    return os.getpid()
+
+
+class _Worker:
+    """One worker process, in an executor of its own so that killing it loses nothing else."""
+
+    __slots__ = ("executor", "pid", "tasks", "running")
+
+    def __init__(self, executor):
+        self.executor = executor
+        self.pid = None
+        self.tasks = 0
+        self.running = None  # executor future of the file it is on
+
+
+class ExtractorPool:
+    """Warm worker processes shared by every conversion job.
+
+    Workers are forked from a fork server that has the extractor imported
+    (spawned where fork is unavailable) and warmed by ``_warm_worker``; all
+    of them are started up front, so a job's first file runs at once.
+
+    Each worker is a one-process executor of its own: a worker that dies or
+    is killed only takes its own file with it (one dead process breaks a
+    whole ProcessPoolExecutor). A worker is replaced once it has run
+    ``max_tasks`` files or reports an RSS above ``max_rss``; the old one
+    exits when idle. (ProcessPoolExecutor's own max_tasks_per_child can
+    deadlock before Python 3.12.3, gh-115634.)
+
+    Files are handed out fairly between jobs: each job's files wait in a
+    queue of their own and a file is only handed to an idle worker. Whenever
+    a worker frees up, the next file comes from the job that smooth weighted
+    round-robin picks among the jobs with files waiting, so a job of weight 2
+    gets twice the workers of a job of weight 1 and no job waits for another
+    to finish.
+
+    Each file gets ``file_timeout`` seconds and ``file_max_bytes`` of memory
+    on top of what its worker already uses (0/None: no limit); going over
+    fails its Future with FileBudgetExceeded. A worker still busy with a file
+    ``_KILL_GRACE`` seconds past the timeout is stuck where the timer cannot
+    reach, so it is killed and replaced. A file whose worker died on its own
+    (say, picked by the OOM killer) goes back to the front of its job's queue
+    once; when its worker dies a second time it is reported.
+
+    ``submit(fn, *args, job=..., weight=...)`` returns a Future for
+    ``fn(*args)``; cancelling it drops the file if it is still waiting.
+    """
+
+    def __init__(self, workers, engine="lite", single_pass=True, max_tasks=200, max_rss=None,
+                 file_timeout=None, file_max_bytes=None):
+        self.workers = workers
+        self.max_tasks = max_tasks
+        self.max_rss = max_rss
+        self.file_timeout = file_timeout
+        self.file_max_bytes = file_max_bytes
+        methods = multiprocessing.get_all_start_methods()
+        self.start_method = "forkserver" if "forkserver" in methods else "spawn"
+        self._context = multiprocessing.get_context(self.start_method)
+        if self.start_method == "forkserver":
+            self._context.set_forkserver_preload(_PRELOAD)
+        self._initargs = (engine, single_pass)
+        self._lock = threading.RLock()  # done callbacks may run inside submit
+        self._pending = {}  # job -> deque of (fn, args, future, lost) waiting for a worker
+        self._running = {}  # executor future -> (worker, job, weight, fn, args, future, lost, started)
+        self._killed = set()  # executor futures whose worker the watchdog killed
+        self._weights = {}
+        self._current = {}  # smooth weighted round-robin state per job
+        self.submitted = self.completed = self.failed = self.cancelled = 0
+        self.replaced = self.killed = self.over_budget = self.retried = 0
+        self.peak_rss = 0
+        self._pids = set()
+        self.started_at = time.time()
+        self._closed = False
+        self._workers = [self._new_worker() for _ in range(workers)]
+        atexit.register(self.shutdown)
+        if file_timeout:
+            threading.Thread(target=self._watchdog, daemon=True).start()
+
+    def _new_worker(self):
+        worker = _Worker(concurrent.futures.ProcessPoolExecutor(
+            max_workers=1, mp_context=self._context,
+            initializer=_warm_worker, initargs=self._initargs,
+        ))
+        # the process starts on the first submit: forks and warms it now, and tells its pid
+        worker.executor.submit(_ping).add_done_callback(partial(self._started, worker))
+        return worker
+
+    def _started(self, worker, ping):
+        if not ping.cancelled() and ping.exception() is None:
+            worker.pid = ping.result()
+
+    def submit(self, fn, *args, job=None, weight=1):
+        """Queue ``fn(*args)`` as one file of ``job``, whose share of the workers is ``weight``."""
+        future = concurrent.futures.Future()
+        with self._lock:
+            self.submitted += 1
+            self._queue(job, weight, (fn, args, future, 0))
+            self._fill()
+        return future
+
+    def _queue(self, job, weight, entry, front=False):
+        queue = self._pending.setdefault(job, deque())
+        if front:
+            queue.appendleft(entry)
+        else:
+            queue.append(entry)
+        self._weights[job] = weight
+        self._current.setdefault(job, 0)
+
+    def _pick(self):
+        """Next job to run a file of (smooth weighted round-robin), or None."""
+        total = 0
+        best = None
+        for job, queue in self._pending.items():
+            if queue:
+                self._current[job] += self._weights[job]
+                total += self._weights[job]
+                if best is None or self._current[job] > self._current[best]:
+                    best = job
+        if best is not None:
+            self._current[best] -= total
+        return best
+
+    def _fill(self):
+        # called with the lock held: hand waiting files to idle workers
+        idle = [worker for worker in self._workers if worker.running is None]
+        while idle:
+            job = self._pick()
+            if job is None:
+                return
+            fn, args, outer, lost = self._pending[job].popleft()
+            weight = self._weights[job]
+            if not self._pending[job]:
+                del self._pending[job], self._weights[job], self._current[job]
+            # a file run again has its future running already
+            if not lost and not outer.set_running_or_notify_cancel():
+                self.cancelled += 1
+                continue
+            worker = idle.pop()
+            worker.tasks += 1
+            inner = worker.executor.submit(_call, fn, args, self.file_timeout, self.file_max_bytes)
+            worker.running = inner
+            self._running[inner] = (worker, job, weight, fn, args, outer, lost, time.monotonic())
+            inner.add_done_callback(self._done)
+
+    def _done(self, inner):
+        error = concurrent.futures.CancelledError() if inner.cancelled() else inner.exception()
+        if error is None:
+            value, pid, rss = inner.result()
+        with self._lock:
+            worker, job, weight, fn, args, outer, lost, _started = self._running.pop(inner)
+            if worker.running is inner:
+                worker.running = None
+            if inner in self._killed:
+                self._killed.discard(inner)
+                if error is not None:
+                    error = FileBudgetExceeded(f"timed out after {self.file_timeout:g}s, worker killed")
+            elif isinstance(error, concurrent.futures.process.BrokenProcessPool):
+                self._replace(worker)
+                if not lost and not self._closed:
+                    # its worker died under it, not necessarily because of it: once more
+                    self.retried += 1
+                    self._queue(job, weight, (fn, args, outer, lost + 1), front=True)
+                    self._fill()
+                    return
+                error = FileBudgetExceeded("worker crashed")
+            if isinstance(error, FileBudgetExceeded):
+                self.over_budget += 1
+            if error is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+                self._pids.add(pid)
+                self.peak_rss = max(self.peak_rss, rss or 0)
+                if self.max_rss and rss and rss > self.max_rss:
+                    print(f"DEBUG: extractor worker {pid} at {rss // 2**20} MB, replacing it")
+                    self._replace(worker)
+                elif self.max_tasks and worker.tasks >= self.max_tasks:
+                    self._replace(worker)
+            self._fill()
+        if error is not None:
+            outer.set_exception(error)
+        else:
+            outer.set_result(value)
+
+    def _watchdog(self):
+        while not self._closed:
+            time.sleep(1)
+            with self._lock:
+                deadline = time.monotonic() - self.file_timeout - _KILL_GRACE
+                for inner, (worker, *_, started) in list(self._running.items()):
+                    if started < deadline and inner not in self._killed and not inner.done() and worker.pid:
+                        print(f"DEBUG: extractor worker {worker.pid} past the {self.file_timeout:g}s timeout, killing it")
+                        self._killed.add(inner)
+                        self.killed += 1
+                        self._replace(worker)
+                        try:
+                            os.kill(worker.pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+                        except ProcessLookupError:  # finished after all
+                            pass
+                self._fill()
+
+    def _replace(self, worker):
+        # called with the lock held; the old executor finishes (or fails) its file and exits
+        if worker in self._workers and not self._closed:
+            self._workers[self._workers.index(worker)] = self._new_worker()
+            self.replaced += 1
+        worker.running = None
+        worker.executor.shutdown(wait=False)
+
+    def shutdown(self, wait=False):
+        with self._lock:
+            self._closed = True
+            for queue in self._pending.values():
+                for _fn, _args, future, lost in queue:
+                    if lost:  # running already, cannot be cancelled
+                        future.set_exception(concurrent.futures.CancelledError())
+                    else:
+                        future.cancel()
+            self._pending.clear()
+            for worker in self._workers:
+                worker.executor.shutdown(wait=wait, cancel_futures=True)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "start_method": self.start_method,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "cancelled": self.cancelled,
+                "in_flight": sum(worker.running is not None for worker in self._workers),
+                "waiting": sum(len(queue) for queue in self._pending.values()),
+                "jobs_waiting": len(self._pending),
+                "over_budget": self.over_budget,
+                "killed": self.killed,
+                "retried": self.retried,
+                "replaced": self.replaced,
+                "worker_pids_seen": len(self._pids),
+                "peak_rss_mb": round(self.peak_rss / 2**20, 1),
+                "uptime_s": round(time.time() - self.started_at, 1),
+            }
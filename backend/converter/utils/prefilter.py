@@ -0,0 +1,50 @@
+import re
+import time
+
+# character data of <w:t> (and any other prefix's <x:t>) elements; runs are
+# joined without separators so words split across runs come back together
+_TEXT_RE = re.compile(rb"<(?:\w+:)?t(?:\s[^>]*)?>([^<]*)")
+
+
+def xml_text(xml: bytes) -> bytes:
+    """Lowercased text content of a WordprocessingML blob, runs concatenated."""
+    return b"".join(_TEXT_RE.findall(xml)).lower()
+
+
+class MarkerPrefilter:
+    """Rule out fields from the raw document.xml bytes before parsing.
+
+    ``markers`` maps a field to alternatives, each a tuple of words that must
+    all occur somewhere in the document text for the field to be findable.
+    Words are matched on the concatenated run text, so a word split across
+    runs is still found; keeping markers to single words (no spaces or
+    hyphens) keeps them independent of run, cell and whitespace boundaries.
+    Fields without markers are never skipped. A marker hit only means the
+    field *may* match: the prefilter can keep a field it did not need, never
+    drop one it did.
+    """
+
+    def __init__(self, markers):
+        self.markers = {
+            field: [tuple(word.lower().encode() for word in words) for words in alternatives]
+            for field, alternatives in markers.items()
+        }
+        self._words = sorted({word for alts in self.markers.values() for words in alts for word in words})
+
+    def skipped(self, xml: bytes, fields):
+        """(fields whose markers are all absent, debug stats for the scan)."""
+        start = time.perf_counter()
+        text = xml_text(xml)
+        present = {word for word in self._words if text.find(word) >= 0}
+        skipped = [
+            field for field in fields
+            if field in self.markers
+            and not any(all(word in present for word in words) for words in self.markers[field])
+        ]
+        stats = {
+            "xml_bytes": len(xml),
+            "text_bytes": len(text),
+            "ms": round((time.perf_counter() - start) * 1000, 2),
+            "skipped": skipped,
+        }
+        return skipped, stats
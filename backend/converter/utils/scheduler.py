@@ -0,0 +1,148 @@
+import threading
+import time
+from collections import deque
+
+
+class _Job:
+    __slots__ = ("job_id", "files", "fn", "lane", "queued_at", "started_at", "slot")
+
+    def __init__(self, job_id, files, fn, lane):
+        self.job_id = job_id
+        self.files = files
+        self.fn = fn
+        self.lane = lane
+        self.queued_at = time.time()
+        self.started_at = None
+        self.slot = None
+
+
+class JobScheduler:
+    """Runs conversion jobs in a bounded number of threads, first come first served.
+
+    At most ``max_jobs`` jobs run at once; the rest wait in a FIFO queue.
+    Jobs of at most ``short_files`` files go to a separate "short" lane with
+    ``short_slots`` slots of its own (they may also take a free regular
+    slot), so a 3-file job never waits behind a 10,000-file one.
+
+    Start estimates use a moving average of seconds per file over finished
+    jobs (``seconds_per_file`` until the first one finishes).
+    """
+
+    def __init__(self, max_jobs=2, short_files=20, short_slots=1, seconds_per_file=0.5):
+        self.max_jobs = max_jobs
+        self.short_files = short_files
+        self.short_slots = short_slots
+        self.seconds_per_file = seconds_per_file
+        self.started = self.finished = 0
+        self._queues = {"short": deque(), "regular": deque()}
+        self._running = {}  # job_id -> _Job
+        self._lock = threading.Lock()
+
+    def submit(self, job_id, files, fn):
+        """Queue ``fn()`` for ``job_id`` (a job of ``files`` files) and start what can start.
+
+        False when ``job_id`` is already queued or running.
+        """
+        lane = "short" if files <= self.short_files else "regular"
+        with self._lock:
+            if job_id in self._running or any(job.job_id == job_id for q in self._queues.values() for job in q):
+                return False
+            self._queues[lane].append(_Job(job_id, files, fn, lane))
+            self._dispatch()
+        return True
+
+    def cancel(self, job_id):
+        """Drop ``job_id`` from the queue; True when it had not started yet."""
+        with self._lock:
+            for queue in self._queues.values():
+                for job in queue:
+                    if job.job_id == job_id:
+                        queue.remove(job)
+                        return True
+        return False
+
+    def _free_slots(self):
+        used = {job.slot for job in self._running.values()}
+        regular = [("regular", i) for i in range(self.max_jobs) if ("regular", i) not in used]
+        short = [("short", i) for i in range(self.short_slots) if ("short", i) not in used]
+        return regular, short
+
+    def _dispatch(self):
+        # called with the lock held
+        regular, short = self._free_slots()
+        while self._queues["short"] and (short or regular):
+            self._start(self._queues["short"].popleft(), short.pop(0) if short else regular.pop(0))
+        while self._queues["regular"] and regular:
+            self._start(self._queues["regular"].popleft(), regular.pop(0))
+
+    def _start(self, job, slot):
+        job.slot = slot
+        job.started_at = time.time()
+        self._running[job.job_id] = job
+        self.started += 1
+        threading.Thread(target=self._run, args=(job,), daemon=True).start()
+
+    def _run(self, job):
+        try:
+            job.fn()
+        finally:
+            elapsed = time.time() - job.started_at
+            with self._lock:
+                self._running.pop(job.job_id, None)
+                self.finished += 1
+                if job.files:
+                    self.seconds_per_file = 0.8 * self.seconds_per_file + 0.2 * elapsed / job.files
+                self._dispatch()
+
+    def position(self, job_id):
+        """Queue state of ``job_id`` for the progress payload ({} when not queued).
+
+        ``queue_position`` is 1-based within the job's lane; the start
+        estimate assumes queued jobs keep their order and take the slot that
+        frees up first.
+        """
+        with self._lock:
+            for lane, queue in self._queues.items():
+                for index, job in enumerate(queue):
+                    if job.job_id == job_id:
+                        wait = self._estimated_wait(lane, index)
+                        return {
+                            "queued": True,
+                            "lane": lane,
+                            "queue_position": index + 1,
+                            "estimated_start_in_s": round(wait, 1),
+                            "estimated_start": round(time.time() + wait),
+                        }
+        return {}
+
+    def _estimated_wait(self, lane, index):
+        now = time.time()
+        slots = {("regular", i): 0.0 for i in range(self.max_jobs)}
+        slots.update({("short", i): 0.0 for i in range(self.short_slots)})
+        for job in self._running.values():
+            left = job.files * self.seconds_per_file - (now - job.started_at)
+            slots[job.slot] = max(left, 0.0)
+
+        def usable(job_lane):
+            return [s for s in slots if job_lane == "short" or s[0] == "regular"]
+
+        if lane == "short":
+            ahead = list(self._queues["short"])[:index]
+        else:
+            # queued short jobs start first and may take regular slots too
+            ahead = list(self._queues["short"]) + list(self._queues["regular"])[:index]
+        for job in ahead:
+            slot = min(usable(job.lane), key=slots.get)
+            slots[slot] += job.files * self.seconds_per_file
+        return min(slots[s] for s in usable(lane))
+
+    def stats(self):
+        with self._lock:
+            return {
+                "running": len(self._running),
+                "queued_short": len(self._queues["short"]),
+                "queued_regular": len(self._queues["regular"]),
+                "started": self.started,
+                "finished": self.finished,
+                "seconds_per_file": round(self.seconds_per_file, 3),
+            }
@@ -0,0 +1,4 @@
+def hit_rate(hits, misses):
+    """``{"hits", "misses", "hit_rate"}`` for a pair of cache counters (rate 0.0 before any lookup)."""
+    lookups = hits + misses
+    return {"hits": hits, "misses": misses, "hit_rate": round(hits / lookups, 3) if lookups else 0.0}
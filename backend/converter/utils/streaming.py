@@ -0,0 +1,38 @@
+from lxml import etree
+from docx.oxml.ns import qn
+from docx.oxml.parser import element_class_lookup
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+
+_BODY = qn("w:body")
+_P = qn("w:p")
+_TBL = qn("w:tbl")
+
+
+def iter_body_blocks(xml, parent):
+    """Stream body-level paragraphs and tables out of a word/document.xml file object.
+
+    Elements are built with python-docx's element classes, so the yielded
+    Paragraph/Table objects behave exactly like ``Document(path)``'s. Each
+    block is detached from the body once the consumer asks for the next one;
+    anything the consumer kept a reference to stays alive, everything else
+    is freed, so memory stays flat however long the report is. Closing the
+    generator stops reading the file.
+    """
+    events = etree.iterparse(
+        xml, events=("end",), tag=(_P, _TBL),
+        remove_blank_text=True, resolve_entities=False, huge_tree=True,
+    )
+    events.set_element_class_lookup(element_class_lookup)
+    for _, elem in events:
+        body = elem.getparent()
+        if body is None or body.tag != _BODY:
+            continue  # paragraph/table nested inside a table cell
+        if elem.tag == _P:
+            yield Paragraph(elem, parent)
+        else:
+            yield Table(elem, parent)
+        # drop this block and anything before it (bookmarks, sdt, ...)
+        while elem.getprevious() is not None:
+            body.remove(elem.getprevious())
+        body.remove(elem)
@@ -0,0 +1,170 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+from lxml import etree
+from docx.oxml.ns import qn
+from docx.styles import BabelFish
+
+_STYLE = qn("w:style")
+_STYLE_ID = qn("w:styleId")
+_TYPE = qn("w:type")
+_DEFAULT = qn("w:default")
+_VAL = qn("w:val")
+_PARSER = etree.XMLParser(resolve_entities=False)
+_OFF = ("0", "false", "off")
+
+
+def _on_off(rPr, tag):
+    """w:b / w:i of an rPr element: True/False when present, None when unset."""
+    if rPr is None:
+        return None
+    elem = rPr.find(qn(tag))
+    if elem is None:
+        return None
+    return elem.get(_VAL, "true").lower() not in _OFF
+
+
+class ResolvedStyle:
+    """A style with its ``basedOn`` chain folded in.
+
+    ``name`` is the UI name, as python-docx's ``style.name`` returns it ("" when
+    the style has none); ``heading_level`` is N for "Heading N" styles (the
+    name without "Heading" is a number) and None otherwise. ``bold`` and
+    ``italic`` are the values the style, or the nearest style it is based
+    on, sets; None when none of them does.
+    """
+    __slots__ = ("style_id", "name", "heading_level", "bold", "italic")
+
+    def __init__(self, style_id, name, bold, italic):
+        self.style_id = style_id
+        self.name = name
+        level = name.replace("Heading", "").strip()
+        self.heading_level = int(level) if level.isdigit() else None
+        self.bold = bold
+        self.italic = italic
+
+
+_NO_STYLE = ResolvedStyle(None, "", None, None)
+
+
+class StyleResolver:
+    """Style lookups for one styles.xml, each style resolved once.
+
+    ``paragraph_style(style_id)`` follows python-docx's ``para.style``: an
+    unknown id, a style of another type or no id at all gives the default
+    paragraph style. Get a shared instance with ``style_resolver(styles_xml)``.
+    """
+
+    def __init__(self, styles_xml):
+        self._elements = {}  # styleId -> w:style
+        self._defaults = {}  # type -> styleId of the (last) default style
+        self._resolved = {}
+        self.default_bold = self.default_italic = None
+        root = etree.fromstring(styles_xml, _PARSER) if styles_xml else None
+        if root is not None:
+            for style in root.iterchildren(_STYLE):
+                style_id = style.get(_STYLE_ID)
+                style_type = style.get(_TYPE, "paragraph")
+                self._elements[style_id] = style
+                if style.get(_DEFAULT) in ("1", "true", "on"):
+                    self._defaults[style_type] = style_id
+            rPr = root.find(f"{qn('w:docDefaults')}/{qn('w:rPrDefault')}/{qn('w:rPr')}")
+            self.default_bold = _on_off(rPr, "w:b")
+            self.default_italic = _on_off(rPr, "w:i")
+        # documents without any bold/italic in their styles keep direct formatting as is
+        self.has_formatting = self.default_bold is not None or self.default_italic is not None or any(
+            style.find(f"{qn('w:rPr')}/{qn(tag)}") is not None
+            for style in self._elements.values() for tag in ("w:b", "w:i")
+        )
+
+    def style(self, style_id):
+        """The ResolvedStyle for ``style_id`` (a style with no name if unknown)."""
+        resolved = self._resolved.get(style_id)
+        if resolved is None:
+            resolved = self._resolved[style_id] = self._resolve(style_id, set())
+        return resolved
+
+    def _resolve(self, style_id, seen):
+        style = self._elements.get(style_id)
+        if style is None or style_id in seen:
+            return _NO_STYLE
+        seen.add(style_id)
+        name = style.find(qn("w:name"))
+        name = BabelFish.internal2ui(name.get(_VAL)) if name is not None and name.get(_VAL) else ""
+        rPr = style.find(qn("w:rPr"))
+        bold, italic = _on_off(rPr, "w:b"), _on_off(rPr, "w:i")
+        based_on = style.find(qn("w:basedOn"))
+        if based_on is not None and (bold is None or italic is None):
+            parent = self._resolved.get(based_on.get(_VAL)) or self._resolve(based_on.get(_VAL), seen)
+            bold = parent.bold if bold is None else bold
+            italic = parent.italic if italic is None else italic
+        return ResolvedStyle(style_id, name, bold, italic)
+
+    def _typed(self, style_id, style_type):
+        style = self._elements.get(style_id) if style_id else None
+        if style is None or style.get(_TYPE, "paragraph") != style_type:
+            style_id = self._defaults.get(style_type)
+        return self.style(style_id) if style_id else _NO_STYLE
+
+    def paragraph_style(self, style_id):
+        return self._typed(style_id, "paragraph")
+
+    def character_style(self, style_id):
+        """Character style of a run; only an explicit w:rStyle applies one."""
+        if not style_id:
+            return _NO_STYLE
+        return self._typed(style_id, "character")
+
+    def run_format(self, direct_bold, direct_italic, run_style_id, para_style):
+        """Effective (bold, italic) of a run.
+
+        Direct formatting wins. Otherwise bold/italic are toggle properties:
+        set by both the character and the paragraph style they cancel out,
+        set by one of them they apply, set by neither the document defaults
+        decide.
+        """
+        if direct_bold is not None and direct_italic is not None:
+            return direct_bold, direct_italic
+        char_style = self.character_style(run_style_id)
+        return (
+            direct_bold if direct_bold is not None else
+            self._toggle(char_style.bold, para_style.bold, self.default_bold),
+            direct_italic if direct_italic is not None else
+            self._toggle(char_style.italic, para_style.italic, self.default_italic),
+        )
+
+    @staticmethod
+    def _toggle(char_value, para_value, default):
+        if char_value is not None and para_value is not None:
+            return char_value != para_value
+        if char_value is not None:
+            return char_value
+        if para_value is not None:
+            return para_value
+        return bool(default)
+
+
+_RESOLVERS = OrderedDict()  # sha1 of styles.xml -> StyleResolver
+_RESOLVERS_LOCK = threading.Lock()
+_MAX_RESOLVERS = 64
+
+
+def style_resolver(styles_xml) -> StyleResolver:
+    """Shared StyleResolver for this styles.xml content.
+
+    Files saved from the same template carry identical styles.xml, so the
+    styles are parsed and resolved once per distinct content in the process.
+    """
+    digest = hashlib.sha1(styles_xml or b"").hexdigest()
+    with _RESOLVERS_LOCK:
+        resolver = _RESOLVERS.get(digest)
+        if resolver is not None:
+            _RESOLVERS.move_to_end(digest)
+            return resolver
+    resolver = StyleResolver(styles_xml)
+    with _RESOLVERS_LOCK:
+        _RESOLVERS[digest] = resolver
+        while len(_RESOLVERS) > _MAX_RESOLVERS:
+            _RESOLVERS.popitem(last=False)
+    return resolver
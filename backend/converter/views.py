@@ -2,9 +2,12 @@ from django.shortcuts import render
 
 # Create your views here.
 import os, uuid, threading, random
+import concurrent.futures
+from functools import partial
 from pathlib import Path
 from django.conf import settings
 from django.http import FileResponse, Http404, HttpResponseBadRequest
+from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from datetime import date
@@ -14,13 +17,83 @@ from openpyxl.styles import Font
 
 
 from converter.utils import extractor
+from converter.utils.cache import ExtractionCache
+from converter.utils.pool import ExtractorPool
+from converter.utils.scheduler import JobScheduler
+from converter.utils.stats import hit_rate
 
 # simple in-memory job tracker
 JOBS = {}
 
+_CACHE = None
+_CACHE_LOCK = threading.Lock()
+_POOL = None
+_POOL_LOCK = threading.Lock()
+_SCHEDULER = None
+_SCHEDULER_LOCK = threading.Lock()
+
+def _extraction_cache():
+    """Shared ExtractionCache, or None when disabled in settings."""
+    global _CACHE
+    if not settings.EXTRACTION_CACHE_ENABLED:
+        return None
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = ExtractionCache(settings.EXTRACTION_CACHE_PATH, settings.EXTRACTION_CACHE_MAX_BYTES)
+        return _CACHE
+
+def _cached_row_fields(path: Path, cache, job_stats: dict):
+    """(cache key, fields) for one file; fields is None unless the same file was converted before."""
+    key = cache.key_for(path) if cache else None
+    if key:
+        fields = cache.get(key)
+        if fields is not None:
+            job_stats["hits"] += 1
+            return key, fields
+        job_stats["misses"] += 1
+    return key, None
+
+def extractor_pool():
+    """Shared warm ExtractorPool, or None when EXTRACTOR_WORKERS is 1 and no file budget is set.
+
+    Started by the first job, or by ConverterConfig.ready() when
+    EXTRACTOR_PREWARM is set.
+    """
+    global _POOL
+    if settings.EXTRACTOR_WORKERS <= 1 and not (settings.EXTRACTOR_FILE_TIMEOUT or settings.EXTRACTOR_FILE_MAX_MB):
+        return None
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ExtractorPool(
+                max(settings.EXTRACTOR_WORKERS, 1),
+                engine=settings.EXTRACTOR_ENGINE,
+                single_pass=settings.EXTRACTOR_SINGLE_PASS,
+                max_tasks=settings.EXTRACTOR_WORKER_MAX_TASKS,
+                max_rss=settings.EXTRACTOR_WORKER_MAX_RSS_MB * 2**20,
+                file_timeout=settings.EXTRACTOR_FILE_TIMEOUT,
+                file_max_bytes=settings.EXTRACTOR_FILE_MAX_MB * 2**20,
+            )
+            print(f"DEBUG: extractor pool started {_POOL.stats()}")
+        return _POOL
+
+def _job_scheduler():
+    """Shared JobScheduler bounding how many conversion jobs run at once."""
+    global _SCHEDULER
+    with _SCHEDULER_LOCK:
+        if _SCHEDULER is None:
+            _SCHEDULER = JobScheduler(
+                max_jobs=settings.CONVERT_MAX_JOBS,
+                short_files=settings.CONVERT_SHORT_JOB_FILES,
+                short_slots=settings.CONVERT_SHORT_JOB_SLOTS,
+            )
+        return _SCHEDULER
+
 def _job_dir(job_id: str) -> Path:
     return Path(settings.MEDIA_ROOT) / job_id
 
+def _job_files(folder: Path) -> list:
+    return [f for f in os.listdir(folder) if f.endswith(".docx") and not f.startswith("~$")]
+
 def _cleanup_uploaded_files(folder: Path):
     """Clean up uploaded Word files after successful conversion, keeping only the output files."""
     try:
@@ -134,12 +207,78 @@ def upload_files(request):
 
 # ------------------- Worker function -------------------
 
+def _row_data(file: str, fields: dict) -> dict:
+    """Spreadsheet row for one converted file."""
+    title = fields["title"]
+    description = fields["description"]
+    toc = fields["toc"]
+    methodology = fields["methodology"]
+    seo_title = fields["seo_title"]
+    breadcrumb_text = fields["breadcrumb_text"]
+    skucode = fields["skucode"]
+    urlrp = fields["urlrp"]
+    breadcrumb_schema = fields["breadcrumb_schema"]
+    meta = fields["meta"]
+    schema2 = fields["schema2"]
+    report = fields["report"]
+
+    # ✅ merge description + report
+    merged_text = (description or "") + "\n\n" + (report or "")
+
+    # ✅ split into parts
+    chunks = extractor.split_into_excel_cells(merged_text)
+
+    row_data = {
+        "File": file,
+        "Title": title,
+    }
+
+    # add merged description parts
+    for j, chunk in enumerate(chunks, start=1):
+        row_data[f"Description_Part{j}"] = chunk
+
+    # add other fields (without Report, because merged already)
+    row_data.update({
+        "TOC": toc,
+        "Segmentation": "<p>.</p>",
+        "Methodology": methodology,
+        "Publish_Date": date.today().strftime('%b-%Y').upper(),
+        "Image": "",  # Blank image column
+        "Currency": "USD",
+        "Single Price": 4485,
+        "RID": "",  # Blank RID column after Single Price
+        "Corporate Price": 6449,
+        "skucode": skucode,
+        "Total Page": random.randint(150, 200),
+        "Date": date.today().strftime("%d-%m-%Y"),
+        "Status": "IN",  # Default status
+        "Report_Docs": "",  # Report docs column
+        "urlNp": urlrp,
+        "Meta Description": meta,
+        "Meta_Key": ".",  # Meta key with dot
+        "Base Year": "2024",
+        "history": "2019-2023",
+        "Enterprise Price": 8339,
+        "SEOTITLE": seo_title,
+        "BreadCrumb Text": breadcrumb_text,
+        "Schema 1": breadcrumb_schema,
+        "Schema 2": schema2,
+        "Sub-Category": ""  # Sub-Category column
+        # ⚠ Report removed
+    })
+
+    return row_data
+
+def _failed_row(file: str, reason: str) -> dict:
+    """Spreadsheet row for a file that could not be converted."""
+    return {"File": file, "Error": reason}
+
 def _convert_worker(job_id: str):
     try:
         JOBS[job_id]["progress"] = 5
         folder = _job_dir(job_id)
 
-        files_to_process = [f for f in os.listdir(folder) if f.endswith(".docx") and not f.startswith("~$")]
+        files_to_process = _job_files(folder)
         total_files = len(files_to_process)
         
         if total_files == 0:
@@ -147,78 +286,76 @@ def _convert_worker(job_id: str):
             JOBS[job_id]["done"] = True
             return
 
-        all_data = []
-        for i, file in enumerate(files_to_process):
-            if JOBS.get(job_id, {}).get("cancelled"):
-                JOBS[job_id]["error"] = "cancelled"
-                JOBS[job_id]["done"] = True
-                _cleanup_uploaded_files(folder)
-                return
-
-            path = folder / file
-            print(f"Processing {file}...")
-
-            # extract fields
-            title = extractor.extract_title(str(path))
-            description = extractor.extract_description(str(path))
-            toc = extractor.extract_toc(str(path))
-            methodology = extractor.extract_methodology_from_faqschema(str(path))
-            seo_title = extractor.extract_seo_title(str(path))
-            breadcrumb_text = extractor.extract_breadcrumb_text(str(path))
-            skucode = extractor.extract_sku_code(str(path))
-            urlrp = extractor.extract_sku_url(str(path))
-            breadcrumb_schema = extractor.extract_breadcrumb_schema(str(path))
-            meta = extractor.extract_meta_description(str(path))
-            schema2 = extractor.extract_faq_schema(str(path))
-            report = extractor.extract_report_coverage_table_with_style(str(path))
-
-            # ✅ merge description + report
-            merged_text = (description or "") + "\n\n" + (report or "")
-
-            # ✅ split into parts
-            chunks = extractor.split_into_excel_cells(merged_text)
-
-            row_data = {
-                "File": file,
-                "Title": title,
-            }
-
-            # add merged description parts
-            for j, chunk in enumerate(chunks, start=1):
-                row_data[f"Description_Part{j}"] = chunk
-
-            # add other fields (without Report, because merged already)
-            row_data.update({
-                "TOC": toc,
-                "Segmentation": "<p>.</p>",
-                "Methodology": methodology,
-                "Publish_Date": date.today().strftime('%b-%Y').upper(),
-                "Image": "",  # Blank image column
-                "Currency": "USD",
-                "Single Price": 4485,
-                "RID": "",  # Blank RID column after Single Price
-                "Corporate Price": 6449,
-                "skucode": skucode,
-                "Total Page": random.randint(150, 200),
-                "Date": date.today().strftime("%d-%m-%Y"),
-                "Status": "IN",  # Default status
-                "Report_Docs": "",  # Report docs column
-                "urlNp": urlrp,
-                "Meta Description": meta,
-                "Meta_Key": ".",  # Meta key with dot
-                "Base Year": "2024",
-                "history": "2019-2023",
-                "Enterprise Price": 8339,
-                "SEOTITLE": seo_title,
-                "BreadCrumb Text": breadcrumb_text,
-                "Schema 1": breadcrumb_schema,
-                "Schema 2": schema2,
-                "Sub-Category": ""  # Sub-Category column
-                # ⚠ Report removed
-            })
-            
-            all_data.append(row_data)
-            JOBS[job_id]["progress"] = 5 + int((i + 1) / total_files * 80)
+        cache = _extraction_cache()
+        JOBS[job_id]["cache"] = job_stats = {"hits": 0, "misses": 0}
+        JOBS[job_id]["headings"] = heading_stats = {"hits": 0, "misses": 0}
+        # files that could not be converted: [{"file", "error"}], also in the sheet's Error column
+        JOBS[job_id]["failures"] = failures = []
+
+        # rows are stored by index as files complete, so the sheet keeps the
+        # files_to_process order whatever order the workers finish in
+        all_data = [None] * total_files
+        completed = 0
+        pool = extractor_pool()
+        # without a pool the files are extracted in a thread of this process,
+        # which keeps the process-wide caches and their stats here
+        executor = pool or concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        futures = {}
+        try:
+            for i, file in enumerate(files_to_process):
+                if JOBS.get(job_id, {}).get("cancelled"):
+                    JOBS[job_id]["error"] = "cancelled"
+                    JOBS[job_id]["done"] = True
+                    _cleanup_uploaded_files(folder)
+                    return
+
+                path = folder / file
+                key, fields = _cached_row_fields(path, cache, job_stats)
+                if fields is not None:
+                    all_data[i] = _row_data(file, fields)
+                    completed += 1
+                    JOBS[job_id]["progress"] = 5 + int(completed / total_files * 80)
+                    continue
+                print(f"Processing {file}...")
+                args = (extractor.extract_row_fields, path, settings.EXTRACTOR_ENGINE, settings.EXTRACTOR_SINGLE_PASS)
+                if pool is None:
+                    future = executor.submit(*args)
+                else:  # the pool interleaves these with the other running jobs' files
+                    future = pool.submit(*args, job=job_id, weight=JOBS[job_id].get("weight", 1))
+                futures[future] = (i, file, key)
+
+            for future in concurrent.futures.as_completed(futures):
+                if JOBS.get(job_id, {}).get("cancelled"):
+                    JOBS[job_id]["error"] = "cancelled"
+                    JOBS[job_id]["done"] = True
+                    _cleanup_uploaded_files(folder)
+                    return
+
+                i, file, key = futures[future]
+                try:
+                    fields, file_heading_stats = future.result()
+                except Exception as e:
+                    # one bad file (over its budget, crashing its worker, ...) only costs its own row
+                    reason = str(e) or type(e).__name__
+                    print(f"DEBUG: {file} failed: {reason}")
+                    failures.append({"file": file, "error": reason})
+                    all_data[i] = _failed_row(file, reason)
+                    completed += 1
+                    JOBS[job_id]["progress"] = 5 + int(completed / total_files * 80)
+                    continue
+                heading_stats["hits"] += file_heading_stats["hits"]
+                heading_stats["misses"] += file_heading_stats["misses"]
+                if key:
+                    cache.put(key, fields)
+                all_data[i] = _row_data(file, fields)
+                completed += 1
+                JOBS[job_id]["progress"] = 5 + int(completed / total_files * 80)
+        finally:
+            # a cancelled or failed job drops the files no worker has started
+            for future in futures:
+                future.cancel()
+            if pool is None:
+                executor.shutdown(wait=False)
 
         if JOBS.get(job_id, {}).get("cancelled"):
             JOBS[job_id]["error"] = "cancelled"
@@ -226,6 +363,16 @@ def _convert_worker(job_id: str):
             _cleanup_uploaded_files(folder)
             return
 
+        if failures:
+            print(f"DEBUG: job {job_id}: {len(failures)} of {total_files} files failed")
+        if cache:
+            print(f"DEBUG: extraction cache job={hit_rate(job_stats['hits'], job_stats['misses'])} total={cache.stats()}")
+        print(f"DEBUG: heading cache job={hit_rate(heading_stats['hits'], heading_stats['misses'])}")
+        if pool is None:  # otherwise the process-wide caches live in the pool's workers
+            print(f"DEBUG: heading cache total={extractor.heading_cache_stats()}")
+        else:
+            print(f"DEBUG: extractor pool {pool.stats()}")
+
         df = pd.DataFrame(all_data)
 
         # enforce column order
@@ -241,7 +388,7 @@ def _convert_worker(job_id: str):
             "Single Price", "RID", "Corporate Price", "skucode", "Total Page", "Date", "Status", "Report_Docs",
             "urlNp", "Meta Description", "Meta_Key", "Base Year", "history",
             "Enterprise Price", "SEOTITLE", "BreadCrumb Text", "Schema 1", "Schema 2", "Sub-Category"
-        ] + other_desc_parts  # Add other Description_Parts at the end
+        ] + other_desc_parts + ["Error"]  # Add other Description_Parts at the end, then failures' reasons
 
         df = df[[col for col in columns_order if col in df.columns]]
 
@@ -292,12 +439,14 @@ def reset_job(request):
     job_id = request.GET.get("jobId")
     if job_id:
         if job_id in JOBS:
+            _job_scheduler().cancel(job_id)
             JOBS[job_id]["cancelled"] = True
             _delete_job_folder(job_id)
             del JOBS[job_id]
         return Response({"reset": True, "jobId": job_id})
     # No jobId: clear all
     for jid in list(JOBS.keys()):
+        _job_scheduler().cancel(jid)
         JOBS[jid]["cancelled"] = True
         _delete_job_folder(jid)
         del JOBS[jid]
@@ -310,9 +459,19 @@ def start_convert(request):
     if not job_id or job_id not in JOBS:
         return HttpResponseBadRequest("Invalid jobId")
 
-    t = threading.Thread(target=_convert_worker, args=(job_id,), daemon=True)
-    t.start()
-    return Response({"started": True})
+    # the job's share of the extractor workers while it runs
+    user = request.user.get_username() if request.user.is_authenticated else ""
+    JOBS[job_id]["weight"] = settings.CONVERT_USER_WEIGHTS.get(user, 1)
+
+    # runs now, or as soon as a slot in the job's lane frees up
+    files = len(_job_files(_job_dir(job_id)))
+    scheduler = _job_scheduler()
+    if not scheduler.submit(job_id, files, partial(_convert_worker, job_id)):
+        # a second POST for the same job does not start it again
+        return Response({"started": False, "error": "Job is already queued or running",
+                         **scheduler.position(job_id)}, status=status.HTTP_409_CONFLICT)
+    print(f"DEBUG: job {job_id} ({files} files, weight {JOBS[job_id]['weight']}) submitted, scheduler {scheduler.stats()}")
+    return Response({"started": True, **scheduler.position(job_id)})
 
 # ------------------- Progress -------------------
 @api_view(['GET'])
@@ -320,7 +479,16 @@ def progress(request):
     job_id = request.GET.get("jobId")
     if not job_id or job_id not in JOBS:
         raise Http404("job not found")
-    return Response(JOBS[job_id])
+    # queued jobs also get lane, queue_position and the estimated start
+    return Response({**JOBS[job_id], **_job_scheduler().position(job_id)})
+
+# ------------------- Extractor pool stats -------------------
+@api_view(['GET'])
+def pool_stats(request):
+    # only reads the pool: polling an idle server must not start the workers
+    with _POOL_LOCK:
+        pool = _POOL
+    return Response(pool.stats() if pool else {"workers": 0, "started": False})
 
 # ------------------- Result download -------------------
 @api_view(['GET'])
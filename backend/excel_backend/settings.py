@@ -72,6 +72,50 @@ DATA_UPLOAD_MAX_NUMBER_FILES = 10000  # adjust as needed
 DATA_UPLOAD_MAX_MEMORY_SIZE = 50 * 1024 * 1024  # 50MB
 FILE_UPLOAD_MAX_MEMORY_SIZE = 50 * 1024 * 1024  # 50MB
 
+# Word extraction engine (all three give the same output):
+#   "docx"   - python-docx Document, loads every part of the package
+#   "lite"   - only document.xml, styles.xml, numbering.xml and rels; media never inflated
+#   "stream" - "lite" + lxml iterparse, flat memory and early exit on very large reports
+EXTRACTOR_ENGINE = os.environ.get("EXTRACTOR_ENGINE", "lite")
+# True: all row fields from one parse and one walk (extract_all_data_fast)
+# False: one extract_* call per field, each parsing the file (reference path)
+EXTRACTOR_SINGLE_PASS = os.environ.get("EXTRACTOR_SINGLE_PASS", "1") == "1"
+# Worker processes extracting one job's files in parallel (default: one per CPU);
+# 1 extracts them one after another in the job's own thread, unless a file budget
+# below is set (a thread cannot be stopped, so it takes a worker process then)
+EXTRACTOR_WORKERS = int(os.environ.get("EXTRACTOR_WORKERS", os.cpu_count() or 1))
+# The worker processes are shared by all jobs; each is replaced after this many
+# files, or once it grows past the RSS limit (Linux only)
+EXTRACTOR_WORKER_MAX_TASKS = int(os.environ.get("EXTRACTOR_WORKER_MAX_TASKS", "200"))
+EXTRACTOR_WORKER_MAX_RSS_MB = int(os.environ.get("EXTRACTOR_WORKER_MAX_RSS_MB", "1024"))
+# The workers start with the first conversion; "1" starts them with the server
+# process instead (never in management commands or runserver's reloader parent)
+EXTRACTOR_PREWARM = os.environ.get("EXTRACTOR_PREWARM", "0") == "1"
+# Budget of one file in its worker (0: none). A file over either is stopped and
+# its row only gets the reason, in an Error column; the job goes on with the rest
+EXTRACTOR_FILE_TIMEOUT = float(os.environ.get("EXTRACTOR_FILE_TIMEOUT", "120"))
+EXTRACTOR_FILE_MAX_MB = int(os.environ.get("EXTRACTOR_FILE_MAX_MB", "1024"))
+
+# Conversion jobs running at once; later ones wait in a FIFO queue. Jobs of at
+# most CONVERT_SHORT_JOB_FILES files queue in a lane of their own with
+# CONVERT_SHORT_JOB_SLOTS extra slots, so they never wait behind a big job
+CONVERT_MAX_JOBS = int(os.environ.get("CONVERT_MAX_JOBS", "2"))
+CONVERT_SHORT_JOB_FILES = int(os.environ.get("CONVERT_SHORT_JOB_FILES", "20"))
+CONVERT_SHORT_JOB_SLOTS = int(os.environ.get("CONVERT_SHORT_JOB_SLOTS", "1"))
+# Running jobs share the extractor workers file by file in proportion to their
+# weight: 1 by default, or the owner's weight from "email=weight,..." here
+CONVERT_USER_WEIGHTS = {
+    user.strip(): int(weight)
+    for user, _, weight in (item.rpartition("=") for item in os.environ.get("CONVERT_USER_WEIGHTS", "").split(","))
+    if user.strip()
+}
+
+# Persistent cache of extracted rows, keyed by .docx SHA-256 + extractor version.
+# Kept as a file directly under MEDIA_ROOT (job cleanup only removes folders).
+EXTRACTION_CACHE_ENABLED = os.environ.get("EXTRACTION_CACHE_ENABLED", "1") == "1"
+EXTRACTION_CACHE_PATH = MEDIA_ROOT / "extraction_cache.sqlite3"
+EXTRACTION_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
 # Timezone (optional, aapke hisaab se)
 
 ROOT_URLCONF = 'excel_backend.urls'